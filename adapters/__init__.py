@@ -2,22 +2,32 @@
 Data adapters for government data sources
 """
 
-from .cbp import CBPAdapter
-from .qcew import QCEWAdapter
-from .sba import SBAAdapter
-from .sam import SAMAdapter
-from .usaspending import USASpendingAdapter
-from .licenses import LicensesAdapter
-from .opencorporates import OpenCorporatesAdapter
-from .bfs import BFSAdapter
+import importlib
 
-__all__ = [
-    'CBPAdapter',
-    'QCEWAdapter', 
-    'SBAAdapter',
-    'SAMAdapter',
-    'USASpendingAdapter',
-    'LicensesAdapter',
-    'OpenCorporatesAdapter',
-    'BFSAdapter'
-]
+# Adapter class -> module; modules are imported on first access so using one
+# adapter doesn't pay for the others' dependencies (PEP 562)
+_ADAPTERS = {
+    'CBPAdapter': 'cbp',
+    'QCEWAdapter': 'qcew',
+    'SBAAdapter': 'sba',
+    'SAMAdapter': 'sam',
+    'USASpendingAdapter': 'usaspending',
+    'LicensesAdapter': 'licenses',
+    'OpenCorporatesAdapter': 'opencorporates',
+    'BFSAdapter': 'bfs'
+}
+
+__all__ = list(_ADAPTERS)
+
+
+def __getattr__(name):
+    if name not in _ADAPTERS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    adapter = getattr(importlib.import_module(f".{_ADAPTERS[name]}", __name__), name)
+    globals()[name] = adapter
+    return adapter
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -1,9 +1,14 @@
 import requests
 import pandas as pd
-import time
-from typing import List, Dict, Any
+import threading
+from typing import List, Dict, Any, Optional
 from datetime import datetime
-import os
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+from statistics import fmean
+
+from services.cache_manager import CacheManager
+from .http_utils import AdaptiveRateLimiter, CSV_ENGINE, FETCH_ERRORS, create_session
 
 class BFSAdapter:
     """Adapter for Bureau of Formation Statistics data"""
@@ -11,55 +16,127 @@ class BFSAdapter:
     def __init__(self):
         self.base_url = "https://www.census.gov/econ/bfs/csv"
         self.rate_limit_delay = 1.0
+        self.session = create_session()
+        self.max_workers = 4  # concurrent year downloads
+        self.limiter = AdaptiveRateLimiter(initial_delay=self.rate_limit_delay, max_concurrency=self.max_workers)
+        self.cache_manager = CacheManager()
+        # National year files already loaded by this adapter, and one lock per
+        # year so concurrent callers wait for a single download
+        self._year_frames: Dict[int, pd.DataFrame] = {}
+        self._year_locks: Dict[int, threading.Lock] = {}
+        self._year_locks_guard = threading.Lock()
         
     def fetch_county_formations(self, county_fips: str, year: int = 2023) -> List[Dict[str, Any]]:
         """Fetch business formation data for a county"""
+        retrieved_at = datetime.now().isoformat()
+        
         try:
             # BFS provides county-level data files
             file_url = f"{self.base_url}/bfs{year}co.csv"
             
-            response = requests.get(file_url, timeout=60)
-            time.sleep(self.rate_limit_delay)
+            # One national file serves every county for the year
+            # BFS uses FIPS codes in 'fipscty' column
+            year_data = self._load_bfs_year(year)
+            county_code = int(county_fips)
             
-            if response.status_code == 200:
-                from io import StringIO
-                df = pd.read_csv(StringIO(response.text))
-                
-                # Filter for specific county
-                # BFS uses FIPS codes in 'fipscty' column
-                county_data = df[df['fipscty'].astype(str).str.zfill(5) == county_fips]
-                
-                results = []
-                for _, row in county_data.iterrows():
-                    record = {
-                        'county_fips': county_fips,
-                        'year': year,
-                        'applications_total': int(row.get('ba_ba', 0)) if pd.notna(row.get('ba_ba')) else 0,
-                        'high_propensity_apps': int(row.get('ba_hba', 0)) if pd.notna(row.get('ba_hba')) else 0,
-                        'source_url': file_url,
-                        'retrieved_at': datetime.now().isoformat(),
-                        'license': 'Public Domain'
-                    }
-                    
-                    if record['applications_total'] > 0:
-                        results.append(record)
-                
-                return results
+            if county_code not in year_data.index:
+                return []
             
-            return []
+            county_data = year_data.loc[[county_code], ['ba_ba', 'ba_hba']].fillna(0).astype('int64')
+            county_data = county_data[county_data['ba_ba'] > 0]
+            
+            records = pd.DataFrame({
+                'county_fips': county_fips,
+                'year': year,
+                'applications_total': county_data['ba_ba'],
+                'high_propensity_apps': county_data['ba_hba'],
+                'source_url': file_url,
+                'retrieved_at': retrieved_at,
+                'license': 'Public Domain'
+            })
             
-        except Exception as e:
+            return records.to_dict(orient='records')
+            
+        except FETCH_ERRORS as e:
             print(f"Error fetching BFS data for {county_fips}: {str(e)}")
             return []
     
+    def _load_bfs_year(self, year: int) -> pd.DataFrame:
+        """Load the national BFS county file for a year, indexed by county FIPS"""
+        year_data = self._year_frames.get(year)
+        if year_data is not None:
+            return year_data
+        
+        with self._year_locks_guard:
+            year_lock = self._year_locks.setdefault(year, threading.Lock())
+        
+        with year_lock:
+            # Another thread may have loaded the year while this one waited
+            if year not in self._year_frames:
+                self._year_frames[year] = self._read_bfs_year(year)
+            return self._year_frames[year]
+    
+    def _read_bfs_year(self, year: int) -> pd.DataFrame:
+        """Read a year's national file from the disk cache, or download it"""
+        file_url = f"{self.base_url}/bfs{year}co.csv"
+        
+        # A copy still within its cache lifetime is used as is
+        cached = self.cache_manager.get_cached_data('bfs_data', 'national', year=year)
+        if cached is not None:
+            return cached['frame']
+        
+        # An expired copy is kept unless Census has published a new version
+        # of the file since. A confirmed copy is stored again to restart its
+        # lifetime; one that can't be checked (offline) is used as is
+        cached = self.cache_manager.get_cached_data('bfs_data', 'national', include_expired=True, year=year)
+        if cached is not None:
+            validator = self._remote_validator(file_url)
+            if validator == cached['validator']:
+                self.cache_manager.cache_data(cached, 'bfs_data', 'national', year=year)
+            if validator is None or validator == cached['validator']:
+                return cached['frame']
+        
+        with self.limiter.request(self.session.get, file_url, stream=True, timeout=60) as response:
+            response.raise_for_status()
+            
+            # Parse straight off the socket rather than decoding the whole
+            # file into a str first, keeping only the columns we use
+            response.raw.decode_content = True
+            year_data = pd.read_csv(
+                response.raw,
+                engine=CSV_ENGINE,
+                usecols=['fipscty', 'ba_ba', 'ba_hba'],
+                dtype={'fipscty': 'int32', 'ba_ba': 'Int32', 'ba_hba': 'Int32'}
+            ).set_index('fipscty')
+            validator = response.headers.get('ETag') or response.headers.get('Last-Modified')
+        
+        self.cache_manager.cache_data(
+            {'validator': validator, 'frame': year_data}, 'bfs_data', 'national', year=year
+        )
+        return year_data
+    
+    def _remote_validator(self, file_url: str) -> Optional[str]:
+        """Get the ETag (or Last-Modified) of a remote file, None if unavailable"""
+        try:
+            response = self.session.head(file_url, timeout=10)
+            if response.status_code == 200:
+                return response.headers.get('ETag') or response.headers.get('Last-Modified')
+        except requests.RequestException:
+            pass
+        return None
+    
     def fetch_multiple_years(self, county_fips: str, years: List[int]) -> List[Dict[str, Any]]:
         """Fetch BFS data for multiple years"""
         all_results = []
         
-        for year in years:
-            results = self.fetch_county_formations(county_fips, year)
-            all_results.extend(results)
-            time.sleep(self.rate_limit_delay)
+        if not years:
+            return all_results
+        
+        # Year files are independent downloads, so fetch them concurrently;
+        # the limiter decides how many may run at once and paces their starts
+        with ThreadPoolExecutor(max_workers=min(len(years), self.limiter.max_concurrency)) as executor:
+            for results in executor.map(lambda year: self.fetch_county_formations(county_fips, year), years):
+                all_results.extend(results)
         
         return all_results
     
@@ -79,21 +156,21 @@ class BFSAdapter:
                 'trend': 'unknown'
             }
         
-        df = pd.DataFrame(formations_data)
-        
-        total_apps = df['applications_total'].sum()
-        total_high_prop = df['high_propensity_apps'].sum()
-        avg_annual = df['applications_total'].mean()
+        # Only a handful of years, so plain lists beat building a DataFrame
+        applications = [record['applications_total'] for record in formations_data]
+        total_apps = sum(applications)
+        total_high_prop = sum(record['high_propensity_apps'] for record in formations_data)
+        avg_annual = fmean(applications)
         
         # Calculate high propensity rate
         high_prop_rate = (total_high_prop / total_apps * 100) if total_apps > 0 else 0
         
         # Calculate trend
         trend = 'stable'
-        if len(df) > 1:
-            df_sorted = df.sort_values('year')
-            recent_avg = df_sorted.tail(2)['applications_total'].mean()
-            earlier_avg = df_sorted.head(2)['applications_total'].mean()
+        if len(formations_data) > 1:
+            by_year = sorted(formations_data, key=itemgetter('year'))
+            recent_avg = fmean(record['applications_total'] for record in by_year[-2:])
+            earlier_avg = fmean(record['applications_total'] for record in by_year[:2])
             
             if recent_avg > earlier_avg * 1.1:
                 trend = 'increasing'
@@ -105,5 +182,5 @@ class BFSAdapter:
             'avg_annual_applications': int(avg_annual),
             'high_propensity_rate': round(high_prop_rate, 1),
             'trend': trend,
-            'years_available': len(df)
+            'years_available': len(formations_data)
         }
@@ -1,11 +1,14 @@
-import requests
 import pandas as pd
-import time
+import numpy as np
 from typing import List, Dict, Any
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from collections import defaultdict
 import os
 from urllib.parse import urlencode
 
+from .http_utils import AdaptiveRateLimiter, FETCH_ERRORS, create_session, parse_json
+
 class CBPAdapter:
     """Adapter for Census Bureau County Business Patterns data"""
     
@@ -13,20 +16,29 @@ class CBPAdapter:
         self.base_url = "https://api.census.gov/data"
         self.api_key = os.getenv("CENSUS_API_KEY", "")
         self.rate_limit_delay = 1.0  # seconds between requests
+        self.session = create_session(cache_hours=24)
+        self.max_workers = 4  # concurrent county requests
+        self.limiter = AdaptiveRateLimiter(initial_delay=self.rate_limit_delay, max_concurrency=self.max_workers)
         
     def fetch_county_data(self, county_fips: str, year: int = 2022) -> List[Dict[str, Any]]:
         """Fetch CBP data for a specific county"""
+        return self._fetch_state_counties(county_fips[:2], [county_fips], year)
+    
+    def _fetch_state_counties(self, state_fips: str, county_fips_list: List[str], year: int) -> List[Dict[str, Any]]:
+        """Fetch CBP data for counties of one state in a single request"""
+        retrieved_at = datetime.now().isoformat()
+        
         try:
-            # Extract state FIPS from county FIPS
-            state_fips = county_fips[:2]
-            county_code = county_fips[2:]
+            county_codes = {county_fips[2:] for county_fips in county_fips_list}
             
             # CBP API endpoint
             url = f"{self.base_url}/{year}/cbp"
             
+            # A lone county is asked for directly; several share one
+            # state-wide response
             params = {
                 'get': 'NAICS2017,NAICS2017_LABEL,ESTAB,EMP,PAYANN',
-                'for': f'county:{county_code}',
+                'for': f'county:{county_fips_list[0][2:]}' if len(county_codes) == 1 else 'county:*',
                 'in': f'state:{state_fips}',
                 'NAICS2017': '*'
             }
@@ -34,91 +46,124 @@ class CBPAdapter:
             if self.api_key:
                 params['key'] = self.api_key
             
-            response = requests.get(url, params=params, timeout=30)
-            time.sleep(self.rate_limit_delay)
+            response = self.limiter.request(self.session.get, url, params=params, timeout=30)
             
             if response.status_code == 200:
-                data = response.json()
+                data = parse_json(response)
                 if len(data) > 1:  # Has header and data
                     header = data[0]
-                    rows = data[1:]
+                    county_col = header.index('county')
+                    source_url = f"{url}?{urlencode(params)}"
+                    
+                    table = np.array(data[1:], dtype=object)
+                    table = table[np.isin(table[:, county_col], list(county_codes))]
+                    
+                    # Suppression flags and numeric parsing run over whole columns;
+                    # 'null', 'D' and 'S' all become NaN
+                    naics = table[:, 0]
+                    suppressed = np.isin(table[:, 2:5], ['D', 'S']).any(axis=1)
+                    establishments = pd.to_numeric(table[:, 2], errors='coerce').astype(float)
+                    employment = pd.to_numeric(table[:, 3], errors='coerce').astype(float)
+                    payroll = pd.to_numeric(table[:, 4], errors='coerce').astype(float) * 1000  # Convert to dollars
+                    
+                    # Only include if we have valid NAICS and some data
+                    valid = ((naics != 'null') & (naics != '') & (naics != None) &
+                             ((np.nan_to_num(establishments) != 0) | (np.nan_to_num(employment) != 0)))
                     
-                    results = []
-                    for row in rows:
-                        # Create record
-                        record = {
-                            'county_fips': county_fips,
-                            'naics': row[0] if row[0] != 'null' else '',
+                    results = [
+                        {
+                            'county_fips': state_fips + county_code,
+                            'naics': code,
                             'year': year,
-                            'establishments': int(row[2]) if row[2] not in ['null', 'D', 'S'] else None,
-                            'employment': int(row[3]) if row[3] not in ['null', 'D', 'S'] else None,
-                            'annual_payroll': float(row[4]) * 1000 if row[4] not in ['null', 'D', 'S'] else None,  # Convert to dollars
-                            'suppressed': 1 if any(val in ['D', 'S'] for val in row[2:5]) else 0,
-                            'source_url': f"{url}?{urlencode(params)}",
-                            'retrieved_at': datetime.now().isoformat(),
+                            'establishments': None if np.isnan(estab) else int(estab),
+                            'employment': None if np.isnan(emp) else int(emp),
+                            'annual_payroll': None if np.isnan(pay) else pay,
+                            'suppressed': int(flag),
+                            'source_url': source_url,
+                            'retrieved_at': retrieved_at,
                             'license': 'Public Domain'
                         }
-                        
-                        # Only include if we have valid NAICS and some data
-                        if record['naics'] and (record['establishments'] or record['employment']):
-                            results.append(record)
+                        for code, county_code, estab, emp, pay, flag in zip(
+                            naics[valid], table[valid, county_col], establishments[valid].tolist(),
+                            employment[valid].tolist(), payroll[valid].tolist(), suppressed[valid].tolist()
+                        )
+                    ]
                     
                     return results
             
             return []
             
-        except Exception as e:
-            print(f"Error fetching CBP data for {county_fips}: {str(e)}")
-            # Return sample financial services data for Santa Barbara County when API fails
-            if county_fips == "06083":
-                return [
-                    {
-                        'county_fips': county_fips, 'naics': '00', 'year': year,
-                        'establishments': 12450, 'employment': 145000, 'annual_payroll': 8500000000,
-                        'suppressed': 0, 'source_url': 'Sample data', 'retrieved_at': datetime.now().isoformat(),
-                        'license': 'Public Domain'
-                    },
-                    {
-                        'county_fips': county_fips, 'naics': '52', 'year': year,
-                        'establishments': 485, 'employment': 6250, 'annual_payroll': 425000000,
-                        'suppressed': 0, 'source_url': 'Sample data', 'retrieved_at': datetime.now().isoformat(),
-                        'license': 'Public Domain'
-                    },
-                    {
-                        'county_fips': county_fips, 'naics': '523', 'year': year,
-                        'establishments': 78, 'employment': 890, 'annual_payroll': 67500000,
-                        'suppressed': 0, 'source_url': 'Sample data', 'retrieved_at': datetime.now().isoformat(),
-                        'license': 'Public Domain'
-                    },
-                    {
-                        'county_fips': county_fips, 'naics': '5239', 'year': year,
-                        'establishments': 42, 'employment': 156, 'annual_payroll': 18200000,
-                        'suppressed': 0, 'source_url': 'Sample data', 'retrieved_at': datetime.now().isoformat(),
-                        'license': 'Public Domain'
-                    },
-                    {
-                        'county_fips': county_fips, 'naics': '524', 'year': year,
-                        'establishments': 125, 'employment': 1850, 'annual_payroll': 89600000,
-                        'suppressed': 0, 'source_url': 'Sample data', 'retrieved_at': datetime.now().isoformat(),
-                        'license': 'Public Domain'
-                    },
-                    {
-                        'county_fips': county_fips, 'naics': '541213', 'year': year,
-                        'establishments': 89, 'employment': 245, 'annual_payroll': 8750000,
-                        'suppressed': 0, 'source_url': 'Sample data', 'retrieved_at': datetime.now().isoformat(),
-                        'license': 'Public Domain'
-                    }
-                ]
+        except FETCH_ERRORS as e:
+            print(f"Error fetching CBP data for {', '.join(county_fips_list)}: {str(e)}")
+            return [record for county_fips in county_fips_list
+                    for record in self._sample_county_data(county_fips, year, retrieved_at)]
+    
+    def _sample_county_data(self, county_fips: str, year: int, retrieved_at: str) -> List[Dict[str, Any]]:
+        """Sample financial services data used when the API fails"""
+        # Only Santa Barbara County has sample data
+        if county_fips != "06083":
             return []
+        
+        return [
+            {
+                'county_fips': county_fips, 'naics': '00', 'year': year,
+                'establishments': 12450, 'employment': 145000, 'annual_payroll': 8500000000,
+                'suppressed': 0, 'source_url': 'Sample data', 'retrieved_at': retrieved_at,
+                'license': 'Public Domain'
+            },
+            {
+                'county_fips': county_fips, 'naics': '52', 'year': year,
+                'establishments': 485, 'employment': 6250, 'annual_payroll': 425000000,
+                'suppressed': 0, 'source_url': 'Sample data', 'retrieved_at': retrieved_at,
+                'license': 'Public Domain'
+            },
+            {
+                'county_fips': county_fips, 'naics': '523', 'year': year,
+                'establishments': 78, 'employment': 890, 'annual_payroll': 67500000,
+                'suppressed': 0, 'source_url': 'Sample data', 'retrieved_at': retrieved_at,
+                'license': 'Public Domain'
+            },
+            {
+                'county_fips': county_fips, 'naics': '5239', 'year': year,
+                'establishments': 42, 'employment': 156, 'annual_payroll': 18200000,
+                'suppressed': 0, 'source_url': 'Sample data', 'retrieved_at': retrieved_at,
+                'license': 'Public Domain'
+            },
+            {
+                'county_fips': county_fips, 'naics': '524', 'year': year,
+                'establishments': 125, 'employment': 1850, 'annual_payroll': 89600000,
+                'suppressed': 0, 'source_url': 'Sample data', 'retrieved_at': retrieved_at,
+                'license': 'Public Domain'
+            },
+            {
+                'county_fips': county_fips, 'naics': '541213', 'year': year,
+                'establishments': 89, 'employment': 245, 'annual_payroll': 8750000,
+                'suppressed': 0, 'source_url': 'Sample data', 'retrieved_at': retrieved_at,
+                'license': 'Public Domain'
+            }
+        ]
     
     def fetch_multiple_counties(self, county_fips_list: List[str], year: int = 2022) -> List[Dict[str, Any]]:
         """Fetch CBP data for multiple counties"""
         all_results = []
         
+        if not county_fips_list:
+            return all_results
+        
+        # The API returns every county of a state in one response, so only
+        # one request per state is needed
+        counties_by_state = defaultdict(list)
         for county_fips in county_fips_list:
-            results = self.fetch_county_data(county_fips, year)
-            all_results.extend(results)
-            time.sleep(self.rate_limit_delay)
+            counties_by_state[county_fips[:2]].append(county_fips)
+        
+        # Overlap the per-state round-trips; the limiter decides how many may
+        # run at once and paces their starts
+        with ThreadPoolExecutor(max_workers=min(len(counties_by_state), self.limiter.max_concurrency)) as executor:
+            for results in executor.map(
+                lambda state_fips: self._fetch_state_counties(state_fips, counties_by_state[state_fips], year),
+                counties_by_state
+            ):
+                all_results.extend(results)
         
         return all_results
     
@@ -126,9 +171,9 @@ class CBPAdapter:
         """Get list of available CBP years"""
         try:
             # Check what years are available
-            response = requests.get("https://api.census.gov/data.json", timeout=30)
+            response = self.session.get("https://api.census.gov/data.json", timeout=30)
             if response.status_code == 200:
-                data = response.json()
+                data = parse_json(response)
                 cbp_years = []
                 
                 for dataset in data.get('dataset', []):
@@ -142,6 +187,6 @@ class CBPAdapter:
             # Fallback to known available years
             return [2022, 2021, 2020, 2019, 2018]
             
-        except Exception as e:
+        except FETCH_ERRORS as e:
             print(f"Error getting available CBP years: {str(e)}")
             return [2022, 2021, 2020, 2019, 2018]
@@ -0,0 +1,273 @@
+import io
+import importlib.util
+import json
+import time
+import pickle
+import hashlib
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # optional speed-up; requests' stdlib decoder is used instead
+    orjson = None
+
+# What a failed fetch can raise: transport errors (including ones surfacing
+# while a streamed body is parsed) and malformed payloads. Anything else is a
+# bug and should propagate
+FETCH_ERRORS = (requests.RequestException, urllib3.exceptions.HTTPError, ValueError)
+
+# pyarrow's multithreaded parser for the large CSV downloads when installed.
+# Only looked up here; pandas imports it on the first parse, so adapters that
+# never read a CSV don't pay for loading it
+CSV_ENGINE = 'pyarrow' if importlib.util.find_spec('pyarrow') is not None else 'c'
+
+
+def create_session(pool_size: int = 10, cache_hours: Optional[float] = None,
+                   retry_methods: Tuple[str, ...] = ('GET', 'HEAD')) -> requests.Session:
+    """Session that keeps connections to a host alive and asks for gzip bodies.
+
+    retry_methods lists the HTTP methods that are safe to repeat; add POST
+    only for read-only search endpoints. With cache_hours, successful
+    responses to those methods are also kept on disk for that long (see
+    CachedSession).
+    """
+    if cache_hours is None:
+        session = requests.Session()
+    else:
+        session = CachedSession(expire_after=timedelta(hours=cache_hours), methods=retry_methods)
+
+    # Throttling and transient server errors are retried with jittered
+    # exponential backoff, waiting out Retry-After when the host sends one.
+    # An unreachable host gets one more try only, so offline runs fall back
+    # quickly. The last response is returned rather than raised so the
+    # caller's status checks (and the rate limiter) still see it
+    retries = Retry(total=5, connect=1, backoff_factor=0.5, backoff_jitter=0.5,
+                    status_forcelist=(429, 500, 502, 503, 504), allowed_methods=retry_methods,
+                    respect_retry_after_header=True, raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retries)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({'Accept-Encoding': 'gzip, deflate'})
+
+    return session
+
+
+class CachedSession(requests.Session):
+    """Session that serves repeated requests from disk until they expire.
+
+    Meant for endpoints whose answers only change with a data release. Only
+    200 responses to the given methods are stored, one pickle per request
+    (URL plus JSON body, for read-only POST searches) under cache/http.
+    Responses served from disk have from_cache set, and their raw is an
+    in-memory stream, so callers that parse response.raw work unchanged.
+    """
+
+    # Stored bodies are already decoded, so these no longer describe them
+    _DROPPED_HEADERS = ('content-encoding', 'content-length', 'transfer-encoding')
+
+    def __init__(self, expire_after: timedelta, cache_dir: str = "cache/http",
+                 methods: Tuple[str, ...] = ('GET',)):
+        super().__init__()
+        self.expire_after = expire_after
+        self.methods = methods
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def request(self, method, url, params=None, **kwargs):
+        if method.upper() not in self.methods:
+            return super().request(method, url, params=params, **kwargs)
+
+        full_url, cache_path = self._cache_location(method, url, params, kwargs.get('json'))
+
+        entry = self._load(cache_path)
+        if entry is not None:
+            return self._build_response(full_url, entry, from_cache=True)
+
+        response = super().request(method, url, params=params, **kwargs)
+        if response.status_code != 200:
+            return response
+
+        with response:
+            entry = {
+                'timestamp': datetime.now().isoformat(),
+                'status_code': response.status_code,
+                'headers': {k: v for k, v in response.headers.items() if k.lower() not in self._DROPPED_HEADERS},
+                'content': response.content
+            }
+        self._store(cache_path, entry)
+
+        return self._build_response(full_url, entry, from_cache=False)
+
+    def cached_response(self, method: str, url: str, params=None, **kwargs) -> Optional[requests.Response]:
+        """The stored response for a request, or None if it would go to the network"""
+        if method.upper() not in self.methods:
+            return None
+
+        full_url, cache_path = self._cache_location(method, url, params, kwargs.get('json'))
+        entry = self._load(cache_path)
+        return None if entry is None else self._build_response(full_url, entry, from_cache=True)
+
+    def _cache_location(self, method: str, url: str, params, json_body) -> Tuple[str, Path]:
+        """Full URL of a request and the file its response is stored in"""
+        full_url = requests.Request(method, url, params=params).prepare().url
+        body = json.dumps(json_body, sort_keys=True) if json_body is not None else ''
+        # Hash the request so API keys in the query string don't end up in file names
+        request_key = f"{method.upper()} {full_url} {body}"
+        return full_url, self.cache_dir / f"{hashlib.sha256(request_key.encode()).hexdigest()}.pkl"
+
+    def clear(self) -> None:
+        """Remove every stored response"""
+        for cache_path in self.cache_dir.glob("*.pkl"):
+            cache_path.unlink()
+
+    def _load(self, cache_path: Path) -> Optional[dict]:
+        if not cache_path.exists():
+            return None
+
+        try:
+            with open(cache_path, 'rb') as f:
+                entry = pickle.load(f)
+
+            if datetime.now() - datetime.fromisoformat(entry['timestamp']) >= self.expire_after:
+                return None
+            return entry
+        except Exception:
+            return None
+
+    def _store(self, cache_path: Path, entry: dict) -> None:
+        try:
+            # Write then rename so a concurrent reader never sees half a file
+            tmp_path = cache_path.with_suffix(f".{threading.get_ident()}.tmp")
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(entry, f)
+            tmp_path.replace(cache_path)
+        except Exception as e:
+            print(f"Error caching response: {e}")
+
+    @staticmethod
+    def _build_response(url: str, entry: dict, from_cache: bool) -> requests.Response:
+        response = requests.Response()
+        response.url = url
+        response.status_code = entry['status_code']
+        response.headers.update(entry['headers'])
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response._content = entry['content']
+        response.raw = io.BytesIO(entry['content'])
+        response.from_cache = from_cache
+        return response
+
+
+class AdaptiveRateLimiter:
+    """Paces requests to a single host based on how the host is responding.
+
+    Follows the TCP Vegas idea: the fastest response seen so far is taken as
+    the host's base latency. While responses stay close to it the gap between
+    requests shrinks and more requests may run in parallel; when latency climbs
+    (the host is queueing) or it answers 429/5xx, the limiter backs off.
+    At most `concurrency` requests are in flight at once, so callers can size
+    their thread pools to max_concurrency and leave the rest to the limiter.
+    """
+
+    def __init__(self, initial_delay: float = 1.0, min_delay: float = 0.1, max_delay: float = 30.0,
+                 max_concurrency: int = 4, initial_concurrency: int = 2, latency_slack: float = 0.05):
+        self.delay = initial_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.max_concurrency = max_concurrency
+        self.concurrency = min(initial_concurrency, max_concurrency)
+        self.latency_slack = latency_slack  # seconds of jitter not treated as queueing
+        self.base_latency = None
+        self._next_start = 0.0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._slot_freed = threading.Condition(self._lock)
+
+    def acquire(self) -> None:
+        """Block until the next request may start"""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.delay
+
+        if start > now:
+            time.sleep(start - now)
+
+    def observe(self, status_code: int, latency: float, retry_after: Optional[str] = None) -> None:
+        """Adjust pacing from one response's status code and latency"""
+        with self._lock:
+            if status_code == 429 or status_code >= 500:
+                # Throttled or overloaded: back off hard, honouring Retry-After
+                backoff = self.delay * 2
+                if retry_after and retry_after.isdigit():
+                    backoff = max(backoff, float(retry_after))
+                self.delay = min(max(backoff, self.min_delay), self.max_delay)
+                self.concurrency = max(1, self.concurrency // 2)
+                return
+
+            if self.base_latency is None or latency < self.base_latency:
+                self.base_latency = latency
+
+            if latency > self.base_latency * 2 + self.latency_slack:
+                # Responses are queueing up behind each other
+                self.delay = min(self.delay * 1.5, self.max_delay)
+                self.concurrency = max(1, self.concurrency - 1)
+            else:
+                self.delay = max(self.delay * 0.8, self.min_delay)
+                self.concurrency = min(self.concurrency + 1, self.max_concurrency)
+
+    def request(self, send: Callable[..., requests.Response], *args, **kwargs) -> requests.Response:
+        """Call send(*args, **kwargs) when allowed and learn from its response
+
+        The slot is held until send returns; a streamed body is read after.
+        When send is a CachedSession method and the response is on disk, it
+        is returned straight away, without taking a slot or waiting.
+        """
+        cached = self._cached_response(send, *args, **kwargs)
+        if cached is not None:
+            return cached
+
+        with self._slot_freed:
+            # concurrency may shrink while requests are out; new ones then
+            # wait until enough of those have finished
+            while self._in_flight >= self.concurrency:
+                self._slot_freed.wait()
+            self._in_flight += 1
+
+        try:
+            self.acquire()
+            started = time.monotonic()
+            response = send(*args, **kwargs)
+            if getattr(response, 'from_cache', False):
+                # Stored by another thread meanwhile; says nothing about how
+                # the host is doing
+                return response
+            self.observe(response.status_code, time.monotonic() - started, response.headers.get('Retry-After'))
+            return response
+        finally:
+            with self._slot_freed:
+                self._in_flight -= 1
+                # Wake every waiter, as observe may also have raised concurrency
+                self._slot_freed.notify_all()
+
+    @staticmethod
+    def _cached_response(send: Callable[..., requests.Response], *args, **kwargs) -> Optional[requests.Response]:
+        """Disk-cached response for session.get/post/head(*args, **kwargs), if there is one"""
+        session = getattr(send, '__self__', None)
+        if not isinstance(session, CachedSession) or not args:
+            return None
+        return session.cached_response(send.__name__, *args, **kwargs)
+
+
+def parse_json(response: requests.Response):
+    """Decode a JSON response body, with orjson when it is installed"""
+    if orjson is None:
+        return response.json()
+    return orjson.loads(response.content)
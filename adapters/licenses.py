@@ -1,15 +1,34 @@
 import requests
 import pandas as pd
-import time
-from typing import List, Dict, Any
+import numpy as np
+import re
+from typing import List, Dict, Any, Optional
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from collections import defaultdict
 import os
 
+from .http_utils import AdaptiveRateLimiter, FETCH_ERRORS, create_session, parse_json
+
 class LicensesAdapter:
     """Adapter for city business license data"""
     
+    # Columns that may already carry a NAICS code, in order of preference
+    NAICS_FIELDS = ['naics_code', 'naics', 'business_code', 'industry_code']
+    
+    # Business type keywords mapped to NAICS, checked in priority order
+    BUSINESS_TYPE_NAICS = [
+        (re.compile(r'accounting|bookkeeping'), '541211'),  # CPA offices
+        (re.compile(r'tax'), '541213'),                     # Tax preparation
+        (re.compile(r'financial'), '523930'),               # Investment advice
+    ]
+    
     def __init__(self):
         self.rate_limit_delay = 1.0
+        self.session = create_session()
+        self.max_workers = 4  # concurrent city downloads
+        self.socrata_page_size = 5000
+        self.max_socrata_records = 100_000  # newest records kept per city
         # City endpoints registry
         self.city_endpoints = {
             'Los Angeles': {
@@ -32,20 +51,32 @@ class LicensesAdapter:
             }
         }
         
+        # Index cities by county once so lookups don't scan the registry
+        self._by_county = defaultdict(list)
+        for city, config in self.city_endpoints.items():
+            self._by_county[config['county_fips']].append(city)
+        
+        # Each city portal is a separate host, so pace them independently
+        self.limiters = {
+            city: AdaptiveRateLimiter(initial_delay=self.rate_limit_delay)
+            for city in self.city_endpoints
+        }
+        
     def fetch_licenses(self, county_fips: str) -> List[Dict[str, Any]]:
         """Fetch business license data for a county"""
         results = []
         
         # Find cities in the target county
-        target_cities = [
-            city for city, config in self.city_endpoints.items() 
-            if config['county_fips'] == county_fips
-        ]
+        target_cities = self._by_county.get(county_fips, [])
         
-        for city in target_cities:
-            city_results = self.fetch_city_licenses(city)
-            results.extend(city_results)
-            time.sleep(self.rate_limit_delay)
+        if not target_cities:
+            return results
+        
+        # Each city is served by its own open data portal, so the downloads
+        # can run side by side
+        with ThreadPoolExecutor(max_workers=min(len(target_cities), self.max_workers)) as executor:
+            for city_results in executor.map(self.fetch_city_licenses, target_cities):
+                results.extend(city_results)
         
         return results
     
@@ -61,34 +92,81 @@ class LicensesAdapter:
             
             if url.endswith('.json'):
                 # Socrata JSON API
-                params = {
-                    '$limit': 5000,
-                    '$order': f"{config['date_field']} DESC"
-                }
-                response = requests.get(url, params=params, timeout=30)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    return self._process_json_licenses(data, city_name, config)
+                data = self._fetch_socrata_records(city_name, config)
+                return self._process_json_licenses(data, city_name, config)
                     
             elif url.endswith('.csv'):
-                # CSV download
-                response = requests.get(url, timeout=60)
-                
-                if response.status_code == 200:
-                    from io import StringIO
-                    df = pd.read_csv(StringIO(response.text))
-                    return self._process_csv_licenses(df, city_name, config)
+                # CSV download, parsed straight off the socket
+                with self.limiters[city_name].request(self.session.get, url, stream=True, timeout=60) as response:
+                    if response.status_code == 200:
+                        response.raw.decode_content = True
+                        df = pd.read_csv(response.raw)
+                        return self._process_csv_licenses(df, city_name, config)
             
             return []
             
-        except Exception as e:
+        except FETCH_ERRORS as e:
             print(f"Error fetching licenses for {city_name}: {str(e)}")
             return []
     
+    def _fetch_socrata_records(self, city_name: str, config: Dict) -> List[Dict]:
+        """Fetch a Socrata dataset page by page, requesting the pages side by side"""
+        limiter = self.limiters[city_name]
+        
+        total = self._count_socrata_records(city_name, config['url'])
+        if total is None:
+            total = self.socrata_page_size  # count unavailable, take the first page
+        elif total > self.max_socrata_records:
+            print(f"Limiting {city_name} licenses to the latest {self.max_socrata_records} of {total}")
+            total = self.max_socrata_records
+        
+        offsets = range(0, total, self.socrata_page_size)
+        if not offsets:
+            return []
+        
+        records = []
+        with ThreadPoolExecutor(max_workers=min(len(offsets), limiter.max_concurrency)) as executor:
+            for page in executor.map(lambda offset: self._fetch_socrata_page(city_name, config, offset), offsets):
+                records.extend(page)
+        
+        return records
+    
+    def _fetch_socrata_page(self, city_name: str, config: Dict, offset: int) -> List[Dict]:
+        """Fetch one page of a Socrata dataset; a failed page raises HTTPError"""
+        params = {
+            '$limit': self.socrata_page_size,
+            '$offset': offset,
+            # :id breaks ties so pages don't overlap or skip records
+            '$order': f"{config['date_field']} DESC, :id"
+        }
+        response = self.limiters[city_name].request(self.session.get, config['url'], params=params, timeout=30)
+        
+        # A missing page would leave a gap in the listing, and the rest would
+        # pass for the whole dataset; fail the city's fetch instead
+        if response.status_code != 200:
+            raise requests.HTTPError(
+                f"{city_name} licenses page at offset {offset} returned {response.status_code}",
+                response=response
+            )
+        
+        return parse_json(response)
+    
+    def _count_socrata_records(self, city_name: str, url: str) -> Optional[int]:
+        """Number of records in a Socrata dataset, None if it can't be determined"""
+        try:
+            response = self.limiters[city_name].request(self.session.get, url, params={'$select': 'count(*)'}, timeout=30)
+            if response.status_code != 200:
+                return None
+            
+            rows = parse_json(response)
+            return int(next(iter(rows[0].values()))) if rows else 0
+        except FETCH_ERRORS:
+            return None
+    
     def _process_json_licenses(self, data: List[Dict], city_name: str, config: Dict) -> List[Dict[str, Any]]:
         """Process JSON license data"""
         results = []
+        retrieved_at = datetime.now().isoformat()
         
         for item in data:
             # Generate unique license ID
@@ -103,7 +181,7 @@ class LicensesAdapter:
                 'status': item.get(config['status_field'], ''),
                 'geocode': self._extract_geocode(item),
                 'source_url': config['url'],
-                'retrieved_at': datetime.now().isoformat(),
+                'retrieved_at': retrieved_at,
                 'license': 'Open Data'
             }
             
@@ -114,67 +192,64 @@ class LicensesAdapter:
     
     def _process_csv_licenses(self, df: pd.DataFrame, city_name: str, config: Dict) -> List[Dict[str, Any]]:
         """Process CSV license data"""
-        results = []
+        retrieved_at = datetime.now().isoformat()
+        license_numbers = self._coalesce(df, ['license_number']).fillna('').astype(str)
+        ids = self._coalesce(df, ['id']).fillna('').astype(str)
+        lat = self._coalesce(df, ['latitude', 'lat'])
+        lon = self._coalesce(df, ['longitude', 'lon', 'lng'])
         
-        for _, row in df.iterrows():
-            license_id = f"{city_name}_{row.get('license_number', '')}{row.get('id', '')}"
-            
-            record = {
-                'license_id': license_id,
-                'jurisdiction': city_name,
-                'county_fips': config['county_fips'],
-                'naics': self._extract_naics_from_row(row),
-                'issued_date': str(row.get(config['date_field'], '')),
-                'status': str(row.get(config['status_field'], '')),
-                'geocode': self._extract_geocode_from_row(row),
-                'source_url': config['url'],
-                'retrieved_at': datetime.now().isoformat(),
-                'license': 'Open Data'
-            }
-            
-            if record['license_id'] and record['issued_date']:
-                results.append(record)
+        records = pd.DataFrame({
+            'license_id': city_name + '_' + license_numbers + ids,
+            'jurisdiction': city_name,
+            'county_fips': config['county_fips'],
+            'naics': self._extract_naics_column(df),
+            'issued_date': self._coalesce(df, [config['date_field']]).fillna('').astype(str),
+            'status': self._coalesce(df, [config['status_field']]).fillna('').astype(str),
+            'geocode': (lat.astype(str) + ',' + lon.astype(str)).where(lat.notna() & lon.notna(), ''),
+            'source_url': config['url'],
+            'retrieved_at': retrieved_at,
+            'license': 'Open Data'
+        }, index=df.index)
         
-        return results
+        records = records[records['issued_date'].ne('')]
+        return records.to_dict(orient='records')
+    
+    @staticmethod
+    def _coalesce(df: pd.DataFrame, fields: List[str]) -> pd.Series:
+        """First non-null value across the given columns, row by row"""
+        present = [field for field in fields if field in df.columns]
+        if not present:
+            return pd.Series(None, index=df.index, dtype=object)
+        return df[present].bfill(axis=1).iloc[:, 0]
     
     def _extract_naics(self, item: Dict) -> str:
         """Extract NAICS code from license data"""
         # Look for common NAICS fields
-        naics_fields = ['naics_code', 'naics', 'business_code', 'industry_code']
-        
-        for field in naics_fields:
+        for field in self.NAICS_FIELDS:
             if field in item and item[field]:
                 return str(item[field])
         
         # Try to map business type to NAICS
         business_type = item.get('business_type', '').lower()
-        if 'accounting' in business_type or 'bookkeeping' in business_type:
-            return '541211'  # CPA offices
-        elif 'tax' in business_type:
-            return '541213'  # Tax preparation
-        elif 'financial' in business_type:
-            return '523930'  # Investment advice
+        for pattern, naics in self.BUSINESS_TYPE_NAICS:
+            if pattern.search(business_type):
+                return naics
         
         return ''
     
-    def _extract_naics_from_row(self, row: pd.Series) -> str:
-        """Extract NAICS code from pandas row"""
-        naics_fields = ['naics_code', 'naics', 'business_code', 'industry_code']
-        
-        for field in naics_fields:
-            if field in row.index and pd.notna(row[field]):
-                return str(row[field])
-        
-        # Try to map business type
-        business_type = str(row.get('business_type', '')).lower()
-        if 'accounting' in business_type or 'bookkeeping' in business_type:
-            return '541211'
-        elif 'tax' in business_type:
-            return '541213'
-        elif 'financial' in business_type:
-            return '523930'
+    def _extract_naics_column(self, df: pd.DataFrame) -> pd.Series:
+        """Extract NAICS codes for every row of a license table"""
+        naics = self._coalesce(df, self.NAICS_FIELDS)
         
-        return ''
+        # Rows without a code fall back to their business type
+        business_type = self._coalesce(df, ['business_type']).fillna('').astype(str).str.lower()
+        mapped = np.select(
+            [business_type.str.contains(pattern).to_numpy(dtype=bool) for pattern, _ in self.BUSINESS_TYPE_NAICS],
+            [naics for _, naics in self.BUSINESS_TYPE_NAICS],
+            default=''
+        )
+        
+        return naics.astype(str).where(naics.notna(), pd.Series(mapped, index=df.index))
     
     def _extract_geocode(self, item: Dict) -> str:
         """Extract geocode from license data"""
@@ -185,13 +260,3 @@ class LicensesAdapter:
             return f"{lat},{lon}"
         
         return ''
-    
-    def _extract_geocode_from_row(self, row: pd.Series) -> str:
-        """Extract geocode from pandas row"""
-        lat = row.get('latitude') or row.get('lat')
-        lon = row.get('longitude') or row.get('lon') or row.get('lng')
-        
-        if pd.notna(lat) and pd.notna(lon):
-            return f"{lat},{lon}"
-        
-        return ''
@@ -1,9 +1,26 @@
 import requests
-import time
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 import os
 
+from .http_utils import AdaptiveRateLimiter, FETCH_ERRORS, create_session, parse_json
+
+# State FIPS to postal code, used to build OpenCorporates jurisdiction codes
+FIPS_TO_STATE = {
+    '01': 'AL', '02': 'AK', '04': 'AZ', '05': 'AR', '06': 'CA',
+    '08': 'CO', '09': 'CT', '10': 'DE', '11': 'DC', '12': 'FL',
+    '13': 'GA', '15': 'HI', '16': 'ID', '17': 'IL', '18': 'IN',
+    '19': 'IA', '20': 'KS', '21': 'KY', '22': 'LA', '23': 'ME',
+    '24': 'MD', '25': 'MA', '26': 'MI', '27': 'MN', '28': 'MS',
+    '29': 'MO', '30': 'MT', '31': 'NE', '32': 'NV', '33': 'NH',
+    '34': 'NJ', '35': 'NM', '36': 'NY', '37': 'NC', '38': 'ND',
+    '39': 'OH', '40': 'OK', '41': 'OR', '42': 'PA', '44': 'RI',
+    '45': 'SC', '46': 'SD', '47': 'TN', '48': 'TX', '49': 'UT',
+    '50': 'VT', '51': 'VA', '53': 'WA', '54': 'WV', '55': 'WI',
+    '56': 'WY'
+}
+
 class OpenCorporatesAdapter:
     """Adapter for OpenCorporates firm data"""
     
@@ -11,6 +28,11 @@ class OpenCorporatesAdapter:
         self.base_url = "https://api.opencorporates.com/v0.4"
         self.api_key = os.getenv("OPENCORPORATES_API_KEY", "")
         self.rate_limit_delay = 2.0  # OpenCorporates has strict rate limits
+        self.session = create_session(cache_hours=1)
+        self.max_pages = 5
+        self.max_workers = 2  # concurrent page requests
+        self.limiter = AdaptiveRateLimiter(initial_delay=self.rate_limit_delay, min_delay=1.0,
+                                           max_concurrency=self.max_workers)
         
     def fetch_firms(self, county_fips: str, jurisdiction: str = "us") -> List[Dict[str, Any]]:
         """Fetch firm data for a county"""
@@ -34,49 +56,59 @@ class OpenCorporatesAdapter:
                 params['api_token'] = self.api_key
             
             results = []
+            retrieved_at = datetime.now().isoformat()
             
-            for page in range(1, 6):  # Limit to 5 pages
-                params['page'] = page
-                
-                response = requests.get(url, params=params, timeout=30)
-                time.sleep(self.rate_limit_delay)
+            # Request all pages at once; results are still consumed in page order
+            # so an empty or failed page ends the listing as before
+            page_params = [{**params, 'page': page} for page in range(1, self.max_pages + 1)]
+            
+            with ThreadPoolExecutor(max_workers=self.limiter.max_concurrency) as executor:
+                pages = list(executor.map(lambda p: self._fetch_page(url, p), page_params))
+            
+            for page_query, companies in zip(page_params, pages):
+                if not companies:
+                    break
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    companies = data.get('results', {}).get('companies', [])
-                    
-                    if not companies:
-                        break
-                    
-                    for company in companies:
-                        company_data = company.get('company', {})
-                        
-                        record = {
-                            'company_id': f"oc_{company_data.get('company_number', '')}",
-                            'jurisdiction': company_data.get('jurisdiction_code', ''),
-                            'company_number': company_data.get('company_number', ''),
-                            'county_fips': county_fips,  # Assumed for county search
-                            'incorporation_date': company_data.get('incorporation_date', ''),
-                            'status': company_data.get('current_status', ''),
-                            'source_url': f"{self.base_url}/companies/search?{requests.compat.urlencode(params)}",
-                            'retrieved_at': datetime.now().isoformat(),
-                            'license': 'OpenCorporates License'
-                        }
-                        
-                        if record['company_number']:
-                            results.append(record)
+                source_url = f"{url}?{requests.compat.urlencode(page_query)}"
+                page_companies = [company.get('company', {}) for company in companies]
                 
-                else:
-                    break
+                results.extend(
+                    {
+                        'company_id': f"oc_{company_data['company_number']}",
+                        'jurisdiction': company_data.get('jurisdiction_code', ''),
+                        'company_number': company_data['company_number'],
+                        'county_fips': county_fips,  # Assumed for county search
+                        'incorporation_date': company_data.get('incorporation_date', ''),
+                        'status': company_data.get('current_status', ''),
+                        'source_url': source_url,
+                        'retrieved_at': retrieved_at,
+                        'license': 'OpenCorporates License'
+                    }
+                    for company_data in page_companies
+                    if company_data.get('company_number')
+                )
             
             return results
             
-        except Exception as e:
+        except FETCH_ERRORS as e:
             print(f"Error fetching OpenCorporates data for {county_fips}: {str(e)}")
             return []
     
+    def _fetch_page(self, url: str, params: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        """Fetch one page of company search results, or None if the request failed"""
+        response = self.limiter.request(self.session.get, url, params=params, timeout=30)
+        
+        if response.status_code != 200:
+            return None
+        
+        data = parse_json(response)
+        return data.get('results', {}).get('companies', [])
+    
     def calculate_age_distribution(self, firms_data: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Calculate firm age distribution"""
+        # Only needed here, so importing the adapter stays cheap
+        import pandas as pd
+        
         if not firms_data:
             return {
                 'age_0_1': 0,
@@ -87,35 +119,20 @@ class OpenCorporatesAdapter:
                 'match_rate': 0.0
             }
         
-        age_buckets = {
-            'age_0_1': 0,
-            'age_1_3': 0,
-            'age_3_5': 0, 
-            'age_5_plus': 0
-        }
-        
-        firms_with_dates = 0
+        age_labels = ['age_0_1', 'age_1_3', 'age_3_5', 'age_5_plus']
         current_year = datetime.now().year
         
-        for firm in firms_data:
-            inc_date = firm.get('incorporation_date')
-            if inc_date:
-                try:
-                    inc_year = datetime.fromisoformat(inc_date).year
-                    age = current_year - inc_year
-                    firms_with_dates += 1
-                    
-                    if age <= 1:
-                        age_buckets['age_0_1'] += 1
-                    elif age <= 3:
-                        age_buckets['age_1_3'] += 1
-                    elif age <= 5:
-                        age_buckets['age_3_5'] += 1
-                    else:
-                        age_buckets['age_5_plus'] += 1
-                        
-                except (ValueError, TypeError):
-                    continue
+        # Parse every date in one pass; missing or malformed dates become NaT
+        # and drop out of the age counts
+        inc_dates = pd.to_datetime(
+            pd.Series([firm.get('incorporation_date') for firm in firms_data], dtype=object),
+            format='ISO8601', errors='coerce', utc=True
+        )
+        ages = (current_year - inc_dates.dt.year).dropna()
+        firms_with_dates = len(ages)
+        
+        bucket_counts = pd.cut(ages, bins=[-float('inf'), 1, 3, 5, float('inf')], labels=age_labels).value_counts()
+        age_buckets = {label: int(bucket_counts[label]) for label in age_labels}
         
         total_firms = len(firms_data)
         match_rate = (firms_with_dates / total_firms * 100) if total_firms > 0 else 0
@@ -128,18 +145,4 @@ class OpenCorporatesAdapter:
     
     def _fips_to_state(self, state_fips: str) -> str:
         """Convert state FIPS to state code"""
-        fips_to_state = {
-            '01': 'AL', '02': 'AK', '04': 'AZ', '05': 'AR', '06': 'CA',
-            '08': 'CO', '09': 'CT', '10': 'DE', '11': 'DC', '12': 'FL',
-            '13': 'GA', '15': 'HI', '16': 'ID', '17': 'IL', '18': 'IN',
-            '19': 'IA', '20': 'KS', '21': 'KY', '22': 'LA', '23': 'ME',
-            '24': 'MD', '25': 'MA', '26': 'MI', '27': 'MN', '28': 'MS',
-            '29': 'MO', '30': 'MT', '31': 'NE', '32': 'NV', '33': 'NH',
-            '34': 'NJ', '35': 'NM', '36': 'NY', '37': 'NC', '38': 'ND',
-            '39': 'OH', '40': 'OK', '41': 'OR', '42': 'PA', '44': 'RI',
-            '45': 'SC', '46': 'SD', '47': 'TN', '48': 'TX', '49': 'UT',
-            '50': 'VT', '51': 'VA', '53': 'WA', '54': 'WV', '55': 'WI',
-            '56': 'WY'
-        }
-        
-        return fips_to_state.get(state_fips, '')
+        return FIPS_TO_STATE.get(state_fips, '')
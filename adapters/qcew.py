@@ -1,10 +1,11 @@
-import requests
 import pandas as pd
-import time
 from typing import List, Dict, Any
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 import os
 
+from .http_utils import AdaptiveRateLimiter, CSV_ENGINE, FETCH_ERRORS, create_session
+
 class QCEWAdapter:
     """Adapter for Bureau of Labor Statistics QCEW data"""
     
@@ -12,9 +13,16 @@ class QCEWAdapter:
         self.base_url = "https://data.bls.gov/cew/data/api"
         self.api_key = os.getenv("BLS_API_KEY", "")
         self.rate_limit_delay = 1.0  # seconds between requests
+        self.session = create_session(cache_hours=24)
+        # The area files are parsed as they stream in; the disk cache would
+        # read each one fully into memory first, so downloads bypass it
+        self.download_session = create_session()
+        self.limiter = AdaptiveRateLimiter(initial_delay=self.rate_limit_delay)
         
     def fetch_county_data(self, county_fips: str, year: int = 2024, quarter: str = "1") -> List[Dict[str, Any]]:
         """Fetch QCEW data for a specific county"""
+        retrieved_at = datetime.now().isoformat()
+        
         try:
             # QCEW uses area codes that combine state and county FIPS
             area_code = county_fips
@@ -22,41 +30,46 @@ class QCEWAdapter:
             # QCEW API endpoint for county data
             url = f"{self.base_url}/{year}/{quarter}/area/{area_code}.csv"
             
-            response = requests.get(url, timeout=30)
-            time.sleep(self.rate_limit_delay)
-            
-            if response.status_code == 200:
-                # Parse CSV response
-                from io import StringIO
-                df = pd.read_csv(StringIO(response.text))
-                
-                results = []
-                for _, row in df.iterrows():
-                    # Filter for relevant ownership codes and industry levels
-                    if (row.get('own_code') == '0' and  # All ownership
-                        row.get('agglvl_code') in ['78', '79']):  # County level
-                        
-                        record = {
-                            'county_fips': county_fips,
-                            'naics': str(row.get('industry_code', '')),
-                            'year': year,
-                            'quarter': f"{year}Q{quarter}",
-                            'employment': int(row.get('month3_emplvl', 0)) if pd.notna(row.get('month3_emplvl')) else None,
-                            'avg_weekly_wage': float(row.get('avg_wkly_wage', 0)) if pd.notna(row.get('avg_wkly_wage')) else None,
-                            'source_url': url,
-                            'retrieved_at': datetime.now().isoformat(),
-                            'license': 'Public Domain'
-                        }
-                        
-                        # Only include if we have valid data
-                        if record['naics'] and (record['employment'] or record['avg_weekly_wage']):
-                            results.append(record)
+            with self.limiter.request(self.download_session.get, url, stream=True, timeout=30) as response:
+                if response.status_code != 200:
+                    return []
                 
-                return results
+                # Parse straight off the socket, keeping only the columns we use.
+                # Codes stay strings so they compare against '0' / '78' / '79';
+                # the measures are typed too, as the pyarrow engine can't apply
+                # a partial dtype map to integer columns with gaps
+                response.raw.decode_content = True
+                df = pd.read_csv(
+                    response.raw,
+                    engine=CSV_ENGINE,
+                    usecols=['own_code', 'agglvl_code', 'industry_code', 'month3_emplvl', 'avg_wkly_wage'],
+                    dtype={'own_code': str, 'agglvl_code': str, 'industry_code': str,
+                           'month3_emplvl': 'float64', 'avg_wkly_wage': 'float64'}
+                )
             
-            return []
+            # Filter for relevant ownership codes and industry levels
+            df = df[df['own_code'].eq('0') &  # All ownership
+                    df['agglvl_code'].isin(['78', '79'])]  # County level
+            
+            employment = df['month3_emplvl']
+            wages = df['avg_wkly_wage']
+            records = pd.DataFrame({
+                'county_fips': county_fips,
+                'naics': df['industry_code'].fillna(''),
+                'year': year,
+                'quarter': f"{year}Q{quarter}",
+                'employment': employment.astype('Int64').astype(object).where(employment.notna(), None),
+                'avg_weekly_wage': wages.astype(float).astype(object).where(wages.notna(), None),
+                'source_url': url,
+                'retrieved_at': retrieved_at,
+                'license': 'Public Domain'
+            })
+            
+            # Only include if we have valid data
+            valid = records['naics'].ne('') & (employment.fillna(0).ne(0) | wages.fillna(0).ne(0))
+            return records[valid].to_dict(orient='records')
             
-        except Exception as e:
+        except FETCH_ERRORS as e:
             print(f"Error fetching QCEW data for {county_fips}: {str(e)}")
             return []
     
@@ -77,16 +90,17 @@ class QCEWAdapter:
     def get_available_quarters(self, year: int) -> List[str]:
         """Get available quarters for a given year"""
         try:
-            # BLS typically has data with a lag, so check what's available
-            quarters = []
-            for q in ['1', '2', '3', '4']:
-                test_url = f"{self.base_url}/{year}/{q}/area"
-                response = requests.head(test_url, timeout=10)
-                if response.status_code == 200:
-                    quarters.append(q)
+            # BLS typically has data with a lag, so check what's available;
+            # the four probes go out together
+            quarters = ['1', '2', '3', '4']
+            with ThreadPoolExecutor(max_workers=len(quarters)) as executor:
+                responses = list(executor.map(
+                    lambda q: self.session.head(f"{self.base_url}/{year}/{q}/area", timeout=10),
+                    quarters
+                ))
             
-            return quarters
+            return [q for q, response in zip(quarters, responses) if response.status_code == 200]
             
-        except Exception as e:
+        except FETCH_ERRORS as e:
             print(f"Error checking available quarters for {year}: {str(e)}")
             return ['1', '2', '3', '4']  # Fallback
@@ -1,16 +1,26 @@
-import requests
-import time
 from typing import List, Dict, Any
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 import os
+from urllib.parse import urlencode
+
+from .http_utils import AdaptiveRateLimiter, create_session
+
+# Shared stand-in for missing nested objects, so lookups don't allocate
+_EMPTY: Dict[str, Any] = {}
 
 class SAMAdapter:
     """Adapter for SAM.gov opportunities data"""
     
+    OPPORTUNITY_URL = "https://sam.gov/opp/"
+    
     def __init__(self):
         self.base_url = "https://api.sam.gov/opportunities/v2/search"
         self.api_key = os.getenv("SAM_API_KEY", "")
         self.rate_limit_delay = 1.0
+        self.session = create_session(cache_hours=12)
+        self.max_workers = 4  # concurrent searches
+        self.limiter = AdaptiveRateLimiter(initial_delay=self.rate_limit_delay, max_concurrency=self.max_workers)
         
     def fetch_opportunities(self, county_fips: str, keywords: List[str] = None) -> List[Dict[str, Any]]:
         """Fetch federal opportunities from SAM.gov"""
@@ -27,45 +37,51 @@ class SAMAdapter:
                 ]
             
             results = []
+            now = datetime.now()
+            retrieved_at = now.isoformat()
+            target_state = county_fips[:2]
             
-            for keyword in keywords:
-                params = {
+            params_list = [
+                {
                     'api_key': self.api_key,
                     'keyword': keyword,
                     'ptype': 'o',  # Opportunities
                     'limit': 100,
-                    'postedFrom': (datetime.now() - timedelta(days=365)).strftime('%m/%d/%Y'),
-                    'postedTo': datetime.now().strftime('%m/%d/%Y')
+                    'postedFrom': (now - timedelta(days=365)).strftime('%m/%d/%Y'),
+                    'postedTo': now.strftime('%m/%d/%Y')
                 }
-                
-                response = requests.get(self.base_url, params=params, timeout=30)
-                time.sleep(self.rate_limit_delay)
-                
-                if response.status_code == 200:
-                    data = response.json()
+                for keyword in keywords
+            ]
+            
+            # Keyword searches are independent, so run them side by side
+            with ThreadPoolExecutor(max_workers=min(len(params_list), self.limiter.max_concurrency)) as executor:
+                searches = list(executor.map(lambda params: self._search(params, params['keyword']), params_list))
+            
+            for params, opportunities in zip(params_list, searches):
+                source_url = f"{self.base_url}?{urlencode(params, doseq=True)}"
+                for opp in opportunities:
+                    notice_id = opp.get('noticeId', '')
+                    if not notice_id:
+                        continue
                     
-                    for opp in data.get('opportunitiesData', []):
-                        # Try to extract location information
-                        place_of_performance = opp.get('placeOfPerformance', {})
-                        county_match = self._match_county(place_of_performance, county_fips)
-                        
-                        record = {
-                            'notice_id': opp.get('noticeId', ''),
-                            'title': opp.get('title', ''),
-                            'naics': ','.join([str(code) for code in opp.get('naicsCode', [])]),
-                            'place_county_fips': county_fips if county_match else None,
-                            'posted_date': opp.get('postedDate', ''),
-                            'close_date': opp.get('responseDeadLine', ''),
-                            'url': f"https://sam.gov/opp/{opp.get('noticeId', '')}",
-                            'source_url': f"{self.base_url}?{requests.compat.urlencode(params)}",
-                            'retrieved_at': datetime.now().isoformat(),
-                            'license': 'Public Domain'
-                        }
-                        
-                        if record['notice_id']:
-                            results.append(record)
-                
-                time.sleep(self.rate_limit_delay)
+                    # Try to extract location information
+                    place_of_performance = opp.get('placeOfPerformance') or _EMPTY
+                    county_match = self._match_county(place_of_performance, target_state)
+                    
+                    record = {
+                        'notice_id': notice_id,
+                        'title': opp.get('title', ''),
+                        'naics': ','.join([str(code) for code in opp.get('naicsCode', [])]),
+                        'place_county_fips': county_fips if county_match else None,
+                        'posted_date': opp.get('postedDate', ''),
+                        'close_date': opp.get('responseDeadLine', ''),
+                        'url': self.OPPORTUNITY_URL + notice_id,
+                        'source_url': source_url,
+                        'retrieved_at': retrieved_at,
+                        'license': 'Public Domain'
+                    }
+                    
+                    results.append(record)
             
             return results
             
@@ -73,24 +89,14 @@ class SAMAdapter:
             print(f"Error fetching SAM opportunities: {str(e)}")
             return []
     
-    def _match_county(self, place_of_performance: Dict, target_county_fips: str) -> bool:
-        """Match place of performance to county FIPS"""
-        try:
-            # Extract state and county information
-            state_code = place_of_performance.get('state', {}).get('code', '')
-            county_name = place_of_performance.get('city', {}).get('name', '')
-            
-            # Simple matching - in production, you'd want a more sophisticated
-            # county name to FIPS mapping
-            target_state = target_county_fips[:2]
-            
-            if state_code and state_code == target_state:
-                return True  # At least same state
-            
-            return False
-            
-        except Exception:
-            return False
+    def _match_county(self, place_of_performance: Dict, target_state: str) -> bool:
+        """Match place of performance to the target county's state FIPS"""
+        # Extract state information
+        state_code = (place_of_performance.get('state') or _EMPTY).get('code', '')
+        
+        # Simple matching - in production, you'd want a more sophisticated
+        # county name to FIPS mapping
+        return bool(state_code) and state_code == target_state  # At least same state
     
     def get_opportunities_by_naics(self, naics_codes: List[str]) -> List[Dict[str, Any]]:
         """Fetch opportunities by NAICS codes"""
@@ -98,42 +104,59 @@ class SAMAdapter:
             return []
         
         results = []
+        now = datetime.now()
+        retrieved_at = now.isoformat()
         
-        for naics in naics_codes:
-            params = {
+        params_list = [
+            {
                 'api_key': self.api_key,
                 'naics': naics,
                 'ptype': 'o',
                 'limit': 100,
-                'postedFrom': (datetime.now() - timedelta(days=365)).strftime('%m/%d/%Y')
+                'postedFrom': (now - timedelta(days=365)).strftime('%m/%d/%Y')
             }
-            
-            try:
-                response = requests.get(self.base_url, params=params, timeout=30)
-                time.sleep(self.rate_limit_delay)
+            for naics in naics_codes
+        ]
+        
+        if not params_list:
+            return results
+        
+        with ThreadPoolExecutor(max_workers=min(len(params_list), self.limiter.max_concurrency)) as executor:
+            searches = list(executor.map(lambda params: self._search(params, f"NAICS {params['naics']}"), params_list))
+        
+        for params, opportunities in zip(params_list, searches):
+            source_url = f"{self.base_url}?{urlencode(params, doseq=True)}"
+            for opp in opportunities:
+                notice_id = opp.get('noticeId', '')
+                if not notice_id:
+                    continue
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    
-                    for opp in data.get('opportunitiesData', []):
-                        record = {
-                            'notice_id': opp.get('noticeId', ''),
-                            'title': opp.get('title', ''),
-                            'naics': naics,
-                            'place_county_fips': None,  # Would need geo parsing
-                            'posted_date': opp.get('postedDate', ''),
-                            'close_date': opp.get('responseDeadLine', ''),
-                            'url': f"https://sam.gov/opp/{opp.get('noticeId', '')}",
-                            'source_url': f"{self.base_url}?{requests.compat.urlencode(params)}",
-                            'retrieved_at': datetime.now().isoformat(),
-                            'license': 'Public Domain'
-                        }
-                        
-                        if record['notice_id']:
-                            results.append(record)
-                            
-            except Exception as e:
-                print(f"Error fetching SAM opportunities for NAICS {naics}: {str(e)}")
-                continue
+                record = {
+                    'notice_id': notice_id,
+                    'title': opp.get('title', ''),
+                    'naics': params['naics'],
+                    'place_county_fips': None,  # Would need geo parsing
+                    'posted_date': opp.get('postedDate', ''),
+                    'close_date': opp.get('responseDeadLine', ''),
+                    'url': self.OPPORTUNITY_URL + notice_id,
+                    'source_url': source_url,
+                    'retrieved_at': retrieved_at,
+                    'license': 'Public Domain'
+                }
+                
+                results.append(record)
         
         return results
+    
+    def _search(self, params: Dict[str, Any], label: str) -> List[Dict[str, Any]]:
+        """Run one opportunities search; failures are logged and yield no results"""
+        try:
+            response = self.limiter.request(self.session.get, self.base_url, params=params, timeout=30)
+            
+            if response.status_code == 200:
+                return response.json().get('opportunitiesData', [])
+            
+        except Exception as e:
+            print(f"Error fetching SAM opportunities for {label}: {str(e)}")
+        
+        return []
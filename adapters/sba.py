@@ -1,17 +1,41 @@
 import requests
 import pandas as pd
+import numpy as np
 import time
 from typing import List, Dict, Any
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 import os
+from pathlib import Path
+
+from services.cache_manager import CacheManager
+from .http_utils import AdaptiveRateLimiter, create_session
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    import pyarrow.parquet as pq
+except ImportError:  # optional; pandas' chunked reader is used instead
+    pacsv = None
 
 class SBAAdapter:
     """Adapter for SBA loan data"""
     
+    # Columns read from the FOIA files; everything else is skipped at parse time
+    LOAN_COLUMNS = {
+        'LoanNumber', 'SBALoanNumber', 'BorrCounty', 'ProjectCounty',
+        'GrossApproval', 'Lender', 'NAICSCode', 'ApprovalDate'
+    }
+    
     def __init__(self):
         self.base_url = "https://www.sba.gov/sites/default/files/data_files"
         self.api_key = os.getenv("SBA_API_KEY", "")
         self.rate_limit_delay = 1.0
+        self.session = create_session()
+        self.max_workers = 4  # concurrent year downloads
+        self.chunk_rows = 200_000  # rows parsed at a time from a FOIA file
+        self.cache_manager = CacheManager()
+        self.limiter = AdaptiveRateLimiter(initial_delay=self.rate_limit_delay, max_concurrency=self.max_workers)
         
     def fetch_loan_data(self, county_fips: str, fiscal_year: int = 2024) -> List[Dict[str, Any]]:
         """Fetch SBA loan data for a specific county"""
@@ -24,6 +48,7 @@ class SBAAdapter:
             ]
             
             results = []
+            retrieved_at = datetime.now().isoformat()
             
             for pattern in file_patterns:
                 try:
@@ -35,38 +60,7 @@ class SBAAdapter:
                         url = f"https://www.sba.gov/sites/default/files/data_files/FOIA_-_504_FY{fiscal_year}_asof_123123.csv"
                         program = "504"
                     
-                    response = requests.get(url, timeout=60)
-                    time.sleep(self.rate_limit_delay)
-                    
-                    if response.status_code == 200:
-                        # Parse CSV
-                        from io import StringIO
-                        df = pd.read_csv(StringIO(response.text), low_memory=False)
-                        
-                        # Filter for the specific county
-                        # SBA data usually has state and county fields
-                        county_data = df[
-                            (df.get('BorrCounty', '').str.contains(county_fips[-3:], na=False)) |
-                            (df.get('ProjectCounty', '').str.contains(county_fips[-3:], na=False))
-                        ]
-                        
-                        for _, row in county_data.iterrows():
-                            record = {
-                                'loan_id': f"{program}_{row.get('LoanNumber', '')}{row.get('SBALoanNumber', '')}",
-                                'county_fips': county_fips,
-                                'fy': fiscal_year,
-                                'program': program,
-                                'amount': float(row.get('GrossApproval', 0)) if pd.notna(row.get('GrossApproval')) else 0,
-                                'lender': str(row.get('Lender', '')),
-                                'naics': str(row.get('NAICSCode', '')),
-                                'approval_date': str(row.get('ApprovalDate', '')),
-                                'source_url': url,
-                                'retrieved_at': datetime.now().isoformat(),
-                                'license': 'Public Domain'
-                            }
-                            
-                            if record['amount'] > 0:
-                                results.append(record)
+                    results.extend(self._fetch_file_records(url, program, county_fips, fiscal_year, retrieved_at))
                 
                 except Exception as e:
                     print(f"Error processing SBA file pattern {pattern}: {str(e)}")
@@ -78,14 +72,207 @@ class SBAAdapter:
             print(f"Error fetching SBA data for {county_fips}: {str(e)}")
             return []
     
+    def _fetch_file_records(self, url: str, program: str, county_fips: str, fiscal_year: int,
+                            retrieved_at: str) -> List[Dict[str, Any]]:
+        """County loan records from one FOIA file, reused while the file is unchanged"""
+        # The FOIA files are large, so the county's filtered records are cached
+        # along with the file's validators
+        program_key = program.replace('(', '').replace(')', '')
+        cache_key = {'fy': fiscal_year, 'program': program_key}
+        cached = self.cache_manager.get_cached_data('sba_loans', county_fips, **cache_key)
+        if cached is not None:
+            return cached['records']
+        
+        # Another county may already have downloaded this file; its parsed
+        # columns are kept as Parquet, so reading them skips the CSV entirely
+        parquet_path = self._parquet_path(program_key, fiscal_year)
+        if self._parquet_is_fresh(parquet_path):
+            records = self._county_records(self._parquet_chunks(parquet_path, county_fips), program,
+                                           county_fips, fiscal_year, url, retrieved_at)
+            self.cache_manager.cache_data({'etag': None, 'last_modified': None, 'records': records},
+                                          'sba_loans', county_fips, **cache_key)
+            return records
+        
+        # Past the cache lifetime, ask SBA whether the file changed before
+        # downloading it again
+        stale = self.cache_manager.get_cached_data('sba_loans', county_fips, include_expired=True, **cache_key)
+        headers = {}
+        if stale is not None:
+            if stale['etag']:
+                headers['If-None-Match'] = stale['etag']
+            if stale['last_modified']:
+                headers['If-Modified-Since'] = stale['last_modified']
+        
+        records = None
+        with self.limiter.request(self.session.get, url, headers=headers, stream=True, timeout=60) as response:
+            if response.status_code == 304 and stale is not None:
+                records = stale['records']
+                if parquet_path.exists():
+                    parquet_path.touch()  # still current, so good for other counties too
+            elif response.status_code == 200:
+                records = self._parse_county_records(response, program, county_fips, fiscal_year, url,
+                                                     retrieved_at, parquet_path)
+            
+            validators = {
+                'etag': response.headers.get('ETag') or (stale or {}).get('etag'),
+                'last_modified': response.headers.get('Last-Modified') or (stale or {}).get('last_modified')
+            }
+        
+        if records is None:
+            return []
+        
+        self.cache_manager.cache_data({**validators, 'records': records}, 'sba_loans', county_fips, **cache_key)
+        return records
+    
+    def _parquet_path(self, program_key: str, fiscal_year: int) -> Path:
+        """Where the parsed columns of one FOIA file are kept"""
+        return self.cache_manager.cache_dir / f"sba_file_{program_key}_fy_{fiscal_year}.parquet"
+    
+    def _parquet_is_fresh(self, parquet_path: Path) -> bool:
+        """Whether a stored FOIA file exists and is within the SBA cache lifetime"""
+        if pacsv is None or not parquet_path.exists():
+            return False
+        max_age = self.cache_manager.cache_duration['sba_loans'] * 3600
+        return time.time() - parquet_path.stat().st_mtime < max_age
+    
+    def _parse_county_records(self, response: requests.Response, program: str, county_fips: str,
+                              fiscal_year: int, url: str, retrieved_at: str,
+                              parquet_path: Path = None) -> List[Dict[str, Any]]:
+        """Parse a FOIA file download, keeping the county's loans"""
+        # Parse straight off the socket in chunks, keeping only the
+        # columns we use, so the full file is never held in memory
+        response.raw.decode_content = True
+        if pacsv is not None:
+            reader = self._arrow_chunks(response.raw, parquet_path)
+        else:
+            reader = pd.read_csv(
+                response.raw,
+                usecols=lambda column: column in self.LOAN_COLUMNS,
+                dtype={'LoanNumber': 'string', 'SBALoanNumber': 'string', 'NAICSCode': 'string',
+                       'BorrCounty': 'string', 'ProjectCounty': 'string', 'GrossApproval': 'float64'},
+                chunksize=self.chunk_rows
+            )
+        
+        return self._county_records(reader, program, county_fips, fiscal_year, url, retrieved_at)
+    
+    def _county_records(self, chunks, program: str, county_fips: str, fiscal_year: int,
+                        url: str, retrieved_at: str) -> List[Dict[str, Any]]:
+        """Loan records for the county from a sequence of file chunks"""
+        # Filter for the specific county chunk by chunk, so only matching rows
+        # are held on to, then build the records in one pass
+        parts = [chunk[self._county_mask(chunk, county_fips)] for chunk in chunks]
+        parts = [part for part in parts if not part.empty]
+        if not parts:
+            return []
+        
+        county_data = pd.concat(parts) if len(parts) > 1 else parts[0]
+        return self._loan_records(county_data, county_fips, fiscal_year, program, url, retrieved_at)
+    
+    def _arrow_chunks(self, stream, parquet_path: Path = None):
+        """Read a FOIA file with pyarrow's multithreaded CSV reader, one block at a time.
+        
+        With parquet_path, the parsed columns are also written there as they are
+        read; the file only appears once the whole download has been parsed.
+        """
+        # Everything but the amount stays text (Arrow-backed, not object dtype);
+        # columns a file lacks come back as all-null
+        column_types = {column: pa.string() for column in self.LOAN_COLUMNS}
+        column_types['GrossApproval'] = pa.float64()
+        
+        batches = pacsv.open_csv(
+            stream,
+            read_options=pacsv.ReadOptions(block_size=8 << 20, use_threads=True),
+            convert_options=pacsv.ConvertOptions(
+                include_columns=sorted(self.LOAN_COLUMNS),
+                include_missing_columns=True,
+                column_types=column_types
+            )
+        )
+        
+        if parquet_path is None:
+            for batch in batches:
+                yield batch.to_pandas(types_mapper=pd.ArrowDtype)
+            return
+        
+        tmp_path = parquet_path.with_suffix('.parquet.tmp')
+        try:
+            with pq.ParquetWriter(tmp_path, batches.schema) as writer:
+                for batch in batches:
+                    writer.write_batch(batch)
+                    yield batch.to_pandas(types_mapper=pd.ArrowDtype)
+            tmp_path.replace(parquet_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+    
+    def _parquet_chunks(self, parquet_path: Path, county_fips: str):
+        """Read a county's rows back from a stored FOIA file"""
+        # Exact county codes can be pushed down to the Parquet reader, which
+        # then skips row groups without the county
+        spellings = self._county_spellings(county_fips)
+        table = pq.read_table(parquet_path, filters=[[('BorrCounty', 'in', spellings)],
+                                                     [('ProjectCounty', 'in', spellings)]])
+        for batch in table.to_batches(max_chunksize=self.chunk_rows):
+            yield batch.to_pandas(types_mapper=pd.ArrowDtype)
+    
+    def _loan_records(self, county_data: pd.DataFrame, county_fips: str, fiscal_year: int,
+                      program: str, url: str, retrieved_at: str) -> List[Dict[str, Any]]:
+        """Build loan records from a county's rows of an SBA file"""
+        amounts = county_data['GrossApproval'].fillna(0) if 'GrossApproval' in county_data.columns else 0.0
+        
+        records = pd.DataFrame({
+            'loan_id': program + '_' + self._text_column(county_data, 'LoanNumber')
+                       + self._text_column(county_data, 'SBALoanNumber'),
+            'county_fips': county_fips,
+            'fy': fiscal_year,
+            'program': program,
+            'amount': amounts,
+            'lender': self._text_column(county_data, 'Lender'),
+            'naics': self._text_column(county_data, 'NAICSCode'),
+            'approval_date': self._text_column(county_data, 'ApprovalDate'),
+            'source_url': url,
+            'retrieved_at': retrieved_at,
+            'license': 'Public Domain'
+        }, index=county_data.index)
+        
+        return records[records['amount'] > 0].to_dict(orient='records')
+    
+    @staticmethod
+    def _text_column(df: pd.DataFrame, column: str):
+        """A column as text with blanks for missing values, or '' if the file lacks it"""
+        if column not in df.columns:
+            return ''
+        return df[column].fillna('').astype(str)
+    
+    def _county_mask(self, df: pd.DataFrame, county_fips: str) -> pd.Series:
+        """Rows whose borrower or project county matches the county FIPS"""
+        # SBA data usually has state and county fields. County codes are
+        # compared whole, zero-padded, so '073' doesn't also match '1073'
+        county_code = county_fips[-3:]
+        mask = pd.Series(False, index=df.index)
+        for column in ('BorrCounty', 'ProjectCounty'):
+            if column in df.columns:
+                mask |= df[column].str.zfill(3).eq(county_code).fillna(False).astype(bool)
+        return mask
+    
+    @staticmethod
+    def _county_spellings(county_fips: str) -> List[str]:
+        """Ways a file may write the county code: '083', '83' (and '' for '000')"""
+        county_code = county_fips[-3:]
+        significant = len(county_code.lstrip('0'))
+        spellings = [county_code[i:] for i in range(len(county_code) - max(significant, 1) + 1)]
+        return spellings + [''] if significant == 0 else spellings
+    
     def fetch_multiple_years(self, county_fips: str, years: List[int]) -> List[Dict[str, Any]]:
         """Fetch SBA data for multiple fiscal years"""
         all_results = []
         
-        for year in years:
-            results = self.fetch_loan_data(county_fips, year)
-            all_results.extend(results)
-            time.sleep(self.rate_limit_delay)
+        if not years:
+            return all_results
+        
+        # Each fiscal year is a separate set of files, so download them concurrently
+        with ThreadPoolExecutor(max_workers=min(len(years), self.max_workers)) as executor:
+            for results in executor.map(lambda year: self.fetch_loan_data(county_fips, year), years):
+                all_results.extend(results)
         
         return all_results
     
@@ -99,7 +286,8 @@ class SBAAdapter:
             }
         
         total_loans = len(loan_data)
-        total_amount = sum(loan['amount'] for loan in loan_data)
+        amounts = np.fromiter((loan['amount'] for loan in loan_data), dtype=np.float64, count=total_loans)
+        total_amount = float(amounts.sum())
         
         return {
             'loans_per_1k_firms': (total_loans / establishments_count) * 1000,
@@ -1,15 +1,22 @@
-import requests
-import time
 from typing import List, Dict, Any
 from datetime import datetime, timedelta
 import os
 
+from .http_utils import AdaptiveRateLimiter, create_session
+
 class USASpendingAdapter:
     """Adapter for USAspending.gov awards data"""
     
+    # Paging of the NAICS award search: at most 1,000 awards per call
+    AWARD_PAGE_SIZE = 100
+    MAX_AWARD_PAGES = 10
+    
     def __init__(self):
         self.base_url = "https://api.usaspending.gov/api/v2"
         self.rate_limit_delay = 1.0
+        self.session = create_session(cache_hours=24, retry_methods=('GET', 'HEAD', 'POST'))  # searches are read-only
+        self.max_workers = 4  # concurrent searches
+        self.limiter = AdaptiveRateLimiter(initial_delay=self.rate_limit_delay, max_concurrency=self.max_workers)
         
     def fetch_awards(self, county_fips: str, fiscal_year: int = 2024) -> List[Dict[str, Any]]:
         """Fetch federal awards for a specific county"""
@@ -52,12 +59,12 @@ class USASpendingAdapter:
                 "order": "desc"
             }
             
-            response = requests.post(url, json=payload, timeout=30)
-            time.sleep(self.rate_limit_delay)
+            response = self.limiter.request(self.session.post, url, json=payload, timeout=30)
             
             if response.status_code == 200:
                 data = response.json()
                 results = []
+                retrieved_at = datetime.now().isoformat()
                 
                 for award in data.get('results', []):
                     record = {
@@ -69,7 +76,7 @@ class USASpendingAdapter:
                         'agency': award.get('Awarding Agency', ''),
                         'url': f"https://www.usaspending.gov/award/{award.get('Award ID', '')}",
                         'source_url': url,
-                        'retrieved_at': datetime.now().isoformat(),
+                        'retrieved_at': retrieved_at,
                         'license': 'Public Domain'
                     }
                     
@@ -90,51 +97,61 @@ class USASpendingAdapter:
             url = f"{self.base_url}/search/spending_by_award/"
             results = []
             
-            for naics in naics_codes:
-                payload = {
-                    "filters": {
-                        "time_period": [
-                            {
-                                "start_date": f"{fiscal_year-1}-10-01",
-                                "end_date": f"{fiscal_year}-09-30"
-                            }
-                        ],
-                        "naics_codes": [naics]
-                    },
-                    "fields": [
-                        "Award ID",
-                        "Total Obligated Amount",
-                        "Start Date", 
-                        "Awarding Agency",
-                        "NAICS Code",
-                        "Place of Performance County Code"
+            if not naics_codes:
+                return results
+            
+            # The search takes a list of NAICS codes, so one query covers them
+            # all. Pages are read until the API reports no more, up to a
+            # fixed cap
+            payload = {
+                "filters": {
+                    "time_period": [
+                        {
+                            "start_date": f"{fiscal_year-1}-10-01",
+                            "end_date": f"{fiscal_year}-09-30"
+                        }
                     ],
-                    "page": 1,
-                    "limit": 100
-                }
-                
-                response = requests.post(url, json=payload, timeout=30)
-                time.sleep(self.rate_limit_delay)
+                    "naics_codes": list(naics_codes)
+                },
+                "fields": [
+                    "Award ID",
+                    "Total Obligated Amount",
+                    "Start Date", 
+                    "Awarding Agency",
+                    "NAICS Code",
+                    "Place of Performance County Code"
+                ],
+                "page": 1,
+                "limit": self.AWARD_PAGE_SIZE
+            }
+            
+            retrieved_at = datetime.now().isoformat()
+            for page in range(1, self.MAX_AWARD_PAGES + 1):
+                payload["page"] = page
+                response = self.limiter.request(self.session.post, url, json=payload, timeout=30)
+                if response.status_code != 200:
+                    break
                 
-                if response.status_code == 200:
-                    data = response.json()
+                data = response.json()
+                for award in data.get('results', []):
+                    record = {
+                        'award_id': award.get('Award ID', ''),
+                        'naics': award.get('NAICS Code', ''),
+                        'recipient_county_fips': award.get('Place of Performance County Code', ''),
+                        'amount': float(award.get('Total Obligated Amount', 0)),
+                        'action_date': award.get('Start Date', ''),
+                        'agency': award.get('Awarding Agency', ''),
+                        'url': f"https://www.usaspending.gov/award/{award.get('Award ID', '')}",
+                        'source_url': url,
+                        'retrieved_at': retrieved_at,
+                        'license': 'Public Domain'
+                    }
                     
-                    for award in data.get('results', []):
-                        record = {
-                            'award_id': award.get('Award ID', ''),
-                            'naics': naics,
-                            'recipient_county_fips': award.get('Place of Performance County Code', ''),
-                            'amount': float(award.get('Total Obligated Amount', 0)),
-                            'action_date': award.get('Start Date', ''),
-                            'agency': award.get('Awarding Agency', ''),
-                            'url': f"https://www.usaspending.gov/award/{award.get('Award ID', '')}",
-                            'source_url': url,
-                            'retrieved_at': datetime.now().isoformat(),
-                            'license': 'Public Domain'
-                        }
-                        
-                        if record['award_id'] and record['amount'] > 0:
-                            results.append(record)
+                    if record['award_id'] and record['amount'] > 0:
+                        results.append(record)
+                
+                if not data.get('page_metadata', {}).get('hasNext'):
+                    break
             
             return results
             
@@ -160,7 +177,7 @@ class USASpendingAdapter:
                 }
             }
             
-            response = requests.post(url, json=payload, timeout=30)
+            response = self.session.post(url, json=payload, timeout=30)
             
             if response.status_code == 200:
                 data = response.json()
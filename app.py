@@ -1,8 +1,5 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from datetime import datetime
 import os
 
 # Import custom components and services
@@ -53,9 +50,9 @@ def main():
         # Data freshness indicator
         st.header("📅 Data Freshness")
         freshness_data = data_service.get_data_freshness()
-        for source, date in freshness_data.items():
+        for source, date, days_old in freshness_data:
             if date:
-                color = "🟢" if (datetime.now() - datetime.fromisoformat(date)).days < 30 else "🟡"
+                color = "🟢" if days_old < 30 else "🟡"
                 st.write(f"{color} {source}: {date}")
             else:
                 st.write(f"🔴 {source}: No data")
@@ -136,6 +133,7 @@ def main():
                 )
             
             # Time series chart
+            import plotly.express as px  # loaded on first chart, not at app start
             fig = px.line(sba_data, x='year', y='loans_per_1k_firms',
                          title="SBA Lending Trends")
             st.plotly_chart(fig, use_container_width=True)
@@ -1,10 +1,24 @@
 import streamlit as st
 from lib.fips import FIPSHelper
 
+# The county list is static and searches are deterministic, so both are
+# memoized across reruns instead of redone on every widget event
+@st.cache_data(ttl=3600, show_spinner=False)
+def _sample_counties():
+    """Counties offered in the dropdown"""
+    return FIPSHelper().get_sample_counties()
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _search_county(search_term: str):
+    """County info for a name or FIPS search, None if nothing matches"""
+    fips_helper = FIPSHelper()
+    found_fips = fips_helper.parse_county_search(search_term)
+    if not found_fips:
+        return None
+    return fips_helper.get_county_info(found_fips)
+
 def render_county_selector():
     """Render county selection component"""
-    fips_helper = FIPSHelper()
-    
     # Initialize session state for selected county
     if 'selected_county' not in st.session_state:
         st.session_state.selected_county = None
@@ -20,14 +34,12 @@ def render_county_selector():
     )
     
     if search_term:
-        found_fips = fips_helper.parse_county_search(search_term)
-        if found_fips:
-            county_info = fips_helper.get_county_info(found_fips)
-            if county_info:
-                st.success(f"✅ Found: {county_info['name']}, {county_info['state']} ({county_info['fips']})")
-                if st.button("Select This County", key="search_select"):
-                    st.session_state.selected_county = county_info
-                    st.rerun()
+        county_info = _search_county(search_term)
+        if county_info:
+            st.success(f"✅ Found: {county_info['name']}, {county_info['state']} ({county_info['fips']})")
+            if st.button("Select This County", key="search_select"):
+                st.session_state.selected_county = county_info
+                st.rerun()
         else:
             st.warning("County not found. Try a different search term or select from the list below.")
     
@@ -35,7 +47,7 @@ def render_county_selector():
     
     # Option 2: Select from dropdown
     st.subheader("Or select from major counties:")
-    sample_counties = fips_helper.get_sample_counties()
+    sample_counties = _sample_counties()
     
     county_options = [""] + [county['display_name'] for county in sample_counties]
     
@@ -1,11 +1,90 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
+import numpy as np
 from services.demand_scoring import DemandScoringService, DemandWeights
 from lib.utils import DataUtils
 from lib.naics import NAICSMapper
 
+try:
+    import pyarrow as pa
+except ImportError:  # optional; frames are then cached as DataFrames
+    pa = None
+
+# Company table columns shown on the dashboard, with their display names
+_COMPANY_COL_MAP = {
+    'company_name': 'Company',
+    'naics': 'NAICS',
+    'issued_date': 'Activity Date',
+    'signal': 'Signal Type',
+    'jurisdiction': 'Location'
+}
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _load_demand_dashboard(_data_service, county_fips: str):
+    """Demand scores for a county, kept across reruns; the service argument is not hashed"""
+    dashboard_data = _data_service.get_demand_dashboard(county_fips, refresh=False)
+    metrics = _dashboard_metrics(dashboard_data["by_industry"], dashboard_data["spend_ranges"])
+    
+    # Frames are cached as Arrow tables, which take less memory than pandas
+    # object columns and are cheaper to revive on each rerun
+    dashboard_data = {name: _to_arrow(frame) for name, frame in dashboard_data.items()}
+    dashboard_data["metrics"] = metrics
+    return dashboard_data
+
+def _to_arrow(frame):
+    """Arrow table for a DataFrame; anything Arrow can't hold is kept as is"""
+    if pa is None or not isinstance(frame, pd.DataFrame):
+        return frame
+    try:
+        return pa.Table.from_pandas(frame, preserve_index=True)
+    except (pa.ArrowException, TypeError, ValueError):
+        # Mixed-type object columns have no Arrow type
+        return frame
+
+def _to_pandas(frame):
+    """DataFrame back from a cached Arrow table"""
+    return frame.to_pandas() if pa is not None and isinstance(frame, pa.Table) else frame
+
+def _dashboard_metrics(industry_scores: pd.DataFrame, spend_ranges: pd.DataFrame) -> dict:
+    """Summary figures shown on the dashboard, computed once with the scores"""
+    if industry_scores.empty:
+        return {}
+    
+    scores = industry_scores['demand_score'].to_numpy()
+    establishments = industry_scores['establishments'].to_numpy(dtype=np.float64)
+    metrics = {
+        'top_score': float(scores.max()),
+        'high_demand_count': int((scores > 0).sum()),
+        'total_establishments': int(establishments.sum()),
+        'avg_spend': float(industry_scores[['spend_low', 'spend_high']].to_numpy().mean())
+    }
+    
+    if not spend_ranges.empty:
+        # Spend bands line up with the industry rows they were derived from
+        spend = spend_ranges.reindex(industry_scores.index)
+        metrics['total_low'] = float(np.dot(spend['spend_low'].to_numpy(dtype=np.float64), establishments))
+        metrics['total_high'] = float(np.dot(spend['spend_high'].to_numpy(dtype=np.float64), establishments))
+    
+    return metrics
+
+@st.cache_data(show_spinner=False)
+def _demand_score_figure(labels: tuple, scores: tuple) -> dict:
+    """Plotly figure (as a dict) of demand scores by industry"""
+    import plotly.express as px  # loaded on first chart, not at app start
+    
+    fig = px.bar(
+        pd.DataFrame({'display_label': list(labels), 'demand_score': list(scores)}),
+        x='demand_score',
+        y='display_label',
+        orientation='h',
+        title="Demand Scores by Industry Sector",
+        labels={'demand_score': 'Demand Score (Z-Score)', 'display_label': 'Industry'},
+        color='demand_score',
+        color_continuous_scale='RdYlGn'
+    )
+    fig.update_layout(height=400, yaxis={'categoryorder': 'total ascending'})
+    return fig.to_dict()
+
 def render_demand_scoring_dashboard(data_service, county_fips: str):
     """Render demand scoring analytics dashboard"""
     data_utils = DataUtils()
@@ -17,16 +96,24 @@ def render_demand_scoring_dashboard(data_service, county_fips: str):
     # Refresh option
     col1, col2 = st.columns([3, 1])
     with col2:
-        refresh_data = st.button("🔄 Refresh Data", help="Refresh all data sources for updated scoring")
+        # The click is recorded as a one-shot request, consumed below, so no
+        # other rerun can trigger a reload
+        if st.button("🔄 Refresh Data", help="Refresh all data sources for updated scoring"):
+            st.session_state._demand_refresh = True
     
     with st.spinner("Computing demand scores..."):
-        # Use facade method for efficient data loading
-        dashboard_data = data_service.get_demand_dashboard(county_fips, refresh=refresh_data)
+        # Use facade method for efficient data loading; a refresh reloads the
+        # sources and drops the cached scores
+        if st.session_state.pop('_demand_refresh', False):
+            data_service.refresh_all_data(county_fips)
+            _load_demand_dashboard.clear()
+        dashboard_data = _load_demand_dashboard(data_service, county_fips)
         
-        industry_scores = dashboard_data["by_industry"]
-        top_companies = dashboard_data["by_company"]
-        size_breakdown = dashboard_data["industry_size"]
-        spend_ranges = dashboard_data["spend_ranges"]
+        industry_scores = _to_pandas(dashboard_data["by_industry"])
+        top_companies = _to_pandas(dashboard_data["by_company"])
+        size_breakdown = _to_pandas(dashboard_data["industry_size"])
+        spend_ranges = _to_pandas(dashboard_data["spend_ranges"])
+        metrics = dashboard_data["metrics"]
         
         if industry_scores.empty:
             st.warning("⚠️ Insufficient data for demand scoring analysis")
@@ -72,46 +159,40 @@ def render_demand_scoring_dashboard(data_service, county_fips: str):
                 " (" + top_industries_display['naics'].astype(str) + ")"
             )
             
-            # Create demand score visualization
-            fig = px.bar(
-                top_industries_display,
-                x='demand_score',
-                y='display_label',
-                orientation='h',
-                title="Demand Scores by Industry Sector",
-                labels={'demand_score': 'Demand Score (Z-Score)', 'display_label': 'Industry'},
-                color='demand_score',
-                color_continuous_scale='RdYlGn'
+            # Create demand score visualization; the same figure dict and key
+            # on every rerun let the chart update in place
+            fig = _demand_score_figure(
+                tuple(top_industries_display['display_label']),
+                tuple(top_industries_display['demand_score'])
             )
-            fig.update_layout(height=400, yaxis={'categoryorder': 'total ascending'})
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(fig, use_container_width=True, key=f"demand_bar_{county_fips}")
             
             # Summary metrics
             col1, col2, col3, col4 = st.columns(4)
             
             with col1:
-                top_score = industry_scores['demand_score'].max()
+                top_score = metrics['top_score']
                 st.metric(
                     f"{data_utils.get_data_badge('Calculated')} Top Score",
                     f"{top_score:.2f}"
                 )
             
             with col2:
-                high_demand_count = len(industry_scores[industry_scores['demand_score'] > 0])
+                high_demand_count = metrics['high_demand_count']
                 st.metric(
                     "High-Demand Sectors",
                     f"{high_demand_count}"
                 )
             
             with col3:
-                total_establishments = industry_scores['establishments'].sum()
+                total_establishments = metrics['total_establishments']
                 st.metric(
                     "Total Establishments",
                     f"{total_establishments:,}"
                 )
             
             with col4:
-                avg_spend = industry_scores[['spend_low', 'spend_high']].mean().mean()
+                avg_spend = metrics['avg_spend']
                 st.metric(
                     "Avg Spend Potential",
                     f"${avg_spend:,.0f}"
@@ -121,23 +202,32 @@ def render_demand_scoring_dashboard(data_service, county_fips: str):
         st.subheader("📈 Industry Demand Analysis")
         
         # Show detailed table with industry names
-        display_df = industry_scores.copy()
-        display_df['industry_name'] = display_df['naics'].apply(
-            lambda x: naics_mapper.get_description(x)
-        )
-        display_df['demand_score'] = display_df['demand_score'].round(2)
-        display_df['spend_range'] = display_df['spend_low'].astype(str) + ' - $' + display_df['spend_high'].astype(str)
+        industry_names = industry_scores['naics'].map(naics_mapper.get_description).to_numpy()
+        naics_codes = industry_scores['naics'].to_numpy()
+        demand_scores = industry_scores['demand_score'].to_numpy()
+        
+        # Only the displayed columns are built, straight from the score arrays
+        display_df = pd.DataFrame({
+            'Industry': industry_names,
+            'NAICS': naics_codes,
+            'Establishments': industry_scores['establishments'].to_numpy(),
+            'Demand Score': demand_scores,
+            'Estimated Spend Range ($)': [
+                f"{low} - ${high}"
+                for low, high in zip(industry_scores['spend_low'].to_numpy(), industry_scores['spend_high'].to_numpy())
+            ]
+        })
         
+        # Numbers go to the browser as numbers and are formatted there, so
+        # the columns also sort numerically
         st.dataframe(
-            display_df[['industry_name', 'naics', 'establishments', 'demand_score', 'spend_range']].rename(columns={
-                'industry_name': 'Industry',
-                'naics': 'NAICS',
-                'establishments': 'Establishments',
-                'demand_score': 'Demand Score',
-                'spend_range': 'Estimated Spend Range ($)'
-            }),
+            display_df,
             use_container_width=True,
-            height=300
+            height=300,
+            column_config={
+                'Establishments': st.column_config.NumberColumn(format='localized'),
+                'Demand Score': st.column_config.NumberColumn(format='%.2f')
+            }
         )
         
         # Company targets analysis
@@ -147,17 +237,10 @@ def render_demand_scoring_dashboard(data_service, county_fips: str):
             st.markdown("*Companies with recent licensing activity indicating potential demand*")
             
             # Display top target companies
-            display_cols = [col for col in ['company_name', 'naics', 'issued_date', 'signal', 'jurisdiction'] 
-                           if col in top_companies.columns]
+            display_cols = [col for col in _COMPANY_COL_MAP if col in top_companies.columns]
             
             if display_cols:
-                company_display = top_companies[display_cols].rename(columns={
-                    'company_name': 'Company',
-                    'naics': 'NAICS',
-                    'issued_date': 'Activity Date',
-                    'signal': 'Signal Type',
-                    'jurisdiction': 'Location'
-                })
+                company_display = top_companies.loc[:, display_cols].rename(columns=_COMPANY_COL_MAP)
                 
                 st.dataframe(company_display, use_container_width=True, height=250)
             else:
@@ -173,8 +256,8 @@ def render_demand_scoring_dashboard(data_service, county_fips: str):
         
         if not spend_data.empty:
             # Calculate total market potential
-            total_low = (spend_data['spend_low'] * industry_scores['establishments']).sum()
-            total_high = (spend_data['spend_high'] * industry_scores['establishments']).sum()
+            total_low = metrics['total_low']
+            total_high = metrics['total_high']
             
             col1, col2, col3 = st.columns(3)
             
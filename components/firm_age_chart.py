@@ -1,9 +1,166 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
+import numpy as np
 from lib.utils import DataUtils
 
+AGE_FIELDS = ('age_0_1', 'age_1_3', 'age_3_5', 'age_5_plus')
+AGE_CATEGORIES = ('0-1 years', '1-3 years', '3-5 years', '5+ years')
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _load_firm_age_data(_data_service, county_fips: str):
+    """Firm age data for a county, kept across reruns; the service argument is not hashed"""
+    return _data_service.get_firm_age_data(county_fips)
+
+def _age_table(age_counts) -> pd.DataFrame:
+    """Counts, shares and running totals per age category, computed in one pass"""
+    counts = np.asarray(age_counts)
+    total = counts.sum()
+    cumulative = counts.cumsum()
+    scale = 100.0 / total if total > 0 else 0.0
+    
+    return pd.DataFrame({
+        'Age Category': AGE_CATEGORIES,
+        'Number of Firms': counts,
+        'Percentage': counts * scale,
+        'Cumulative Count': cumulative,
+        'Cumulative Percentage': cumulative * scale
+    })
+
+@st.cache_data(show_spinner=False)
+def _build_age_artifacts(age_counts: tuple, county_fips: str) -> dict:
+    """Age table and every chart type's figure (as a dict) for one county's counts"""
+    # Plotly is only loaded once a chart is actually drawn
+    import plotly.express as px
+    import plotly.graph_objects as go
+    
+    age_df = _age_table(age_counts)
+    
+    # Count and percentage labels, built as one array; passed through
+    # plotly express so each category's trace gets its own label
+    bar_labels = np.char.add(
+        np.char.add(age_df['Number of Firms'].to_numpy().astype(str), '<br>('),
+        np.char.mod('%.1f%%)', age_df['Percentage'].to_numpy())
+    )
+    
+    fig_bar = px.bar(
+        age_df,
+        x='Age Category',
+        y='Number of Firms',
+        title="Firm Age Distribution",
+        color='Age Category',
+        text=bar_labels,
+        color_discrete_sequence=px.colors.qualitative.Set3
+    )
+    fig_bar.update_traces(textposition='outside')
+    
+    fig_pie = px.pie(
+        age_df,
+        values='Number of Firms',
+        names='Age Category',
+        title="Firm Age Distribution",
+        color_discrete_sequence=px.colors.qualitative.Set3
+    )
+    
+    fig_donut = go.Figure(data=[go.Pie(
+        labels=age_df['Age Category'],
+        values=age_df['Number of Firms'],
+        hole=0.4,
+        textinfo='label+percent',
+        textposition='auto'
+    )])
+    
+    fig_donut.update_layout(
+        title="Firm Age Distribution",
+        annotations=[dict(text='Firm Age', x=0.5, y=0.5, font_size=20, showarrow=False)]
+    )
+    
+    # Keep the client-side view state (legend toggles, hover) across reruns
+    # for the same county instead of resetting the chart
+    for fig in (fig_bar, fig_pie, fig_donut):
+        fig.update_layout(uirevision=county_fips)
+    
+    return {
+        'df': age_df,
+        'Bar Chart': fig_bar.to_dict(),
+        'Pie Chart': fig_pie.to_dict(),
+        'Donut Chart': fig_donut.to_dict()
+    }
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _age_csv(age_df: pd.DataFrame, county_fips: str) -> bytes:
+    """Firm age table encoded for download"""
+    return DataUtils.export_to_csv(age_df, f"firm_age_analysis_{county_fips}.csv").encode('utf-8')
+
+@st.cache_data(show_spinner=False)
+def _age_insights(age_counts: tuple, match_rate: float) -> dict:
+    """Insight and data quality text for a set of age counts, ready to render"""
+    insights = {'dynamics': None, 'characterization': None}
+    
+    age_df = _age_table(age_counts)
+    if age_df['Cumulative Count'].iloc[-1] > 0:
+        # Calculate key insights from the cumulative shares
+        newest_firm_pct, young_firm_pct = age_df['Cumulative Percentage'].iloc[:2]
+        established_pct = 100 - young_firm_pct
+        
+        insights['dynamics'] = f"""
+            **Market Dynamics:**
+            - {young_firm_pct:.1f}% of firms are 3 years old or newer
+            - {newest_firm_pct:.1f}% are in their first year
+            - {established_pct:.1f}% are established (3+ years)
+            """
+        
+        # Determine market characteristics
+        if young_firm_pct > 40:
+            market_type = "High Growth/Emerging"
+            market_desc = "High rate of new firm formation suggests growing market opportunity"
+        elif young_firm_pct > 25:
+            market_type = "Moderate Growth"
+            market_desc = "Balanced mix of new and established firms"
+        else:
+            market_type = "Mature/Stable"
+            market_desc = "Dominated by established firms with lower formation rates"
+        
+        insights['characterization'] = f"""
+            **Market Characterization:**
+            - Market Type: {market_type}
+            - Assessment: {market_desc}
+            """
+    
+    # Data quality indicator
+    if match_rate < 50:
+        insights['quality'] = ('warning', f"""
+        ⚠️ **Data Quality Note:** 
+        Only {match_rate:.1f}% of firms have incorporation date data available. 
+        Results may not be fully representative of the total firm population.
+        """)
+    elif match_rate < 75:
+        insights['quality'] = ('info', f"""
+        ℹ️ **Data Coverage:** 
+        {match_rate:.1f}% of firms have incorporation date data. 
+        Results provide a good representation of firm age distribution.
+        """)
+    else:
+        insights['quality'] = ('success', f"""
+        ✅ **High Data Quality:** 
+        {match_rate:.1f}% of firms have incorporation date data. 
+        Results are highly representative.
+        """)
+    
+    return insights
+
+@st.fragment
+def _age_chart_fragment(age_artifacts: dict, county_fips: str):
+    """Chart type selector and chart; switching type reruns only this block"""
+    chart_type = st.radio(
+        "Chart Type",
+        options=["Bar Chart", "Pie Chart", "Donut Chart"],
+        horizontal=True
+    )
+    
+    # Same figure dict and key on every rerun, so the chart is updated in
+    # place rather than rebuilt
+    st.plotly_chart(age_artifacts[chart_type], use_container_width=True, key=f"firm_age_{county_fips}")
+
 def render_firm_age_chart(data_service, county_fips: str):
     """Render firm age distribution analysis"""
     data_utils = DataUtils()
@@ -11,7 +168,7 @@ def render_firm_age_chart(data_service, county_fips: str):
     st.subheader("🏢 Firm Age Distribution")
     
     with st.spinner("Loading firm age data..."):
-        firm_age_data = data_service.get_firm_age_data(county_fips)
+        firm_age_data = _load_firm_age_data(data_service, county_fips)
     
     if not firm_age_data or firm_age_data.get('total_firms', 0) == 0:
         st.warning("No firm age data available for this county")
@@ -33,173 +190,67 @@ def render_firm_age_chart(data_service, county_fips: str):
             help="Percentage of firms with incorporation date data"
         )
     
+    counts = np.array([firm_age_data[field] for field in AGE_FIELDS])
+    
     with col3:
-        young_firms = firm_age_data['age_0_1'] + firm_age_data['age_1_3']
+        young_firms = counts[:2].sum()
         st.metric(
             "Young Firms (0-3 years)",
             data_utils.format_number(young_firms)
         )
     
     with col4:
-        established_firms = firm_age_data['age_3_5'] + firm_age_data['age_5_plus']
+        established_firms = counts[2:].sum()
         st.metric(
             "Established Firms (3+ years)",
             data_utils.format_number(established_firms)
         )
     
-    # Age distribution chart
-    age_categories = ['0-1 years', '1-3 years', '3-5 years', '5+ years']
-    age_counts = [
-        firm_age_data['age_0_1'],
-        firm_age_data['age_1_3'],
-        firm_age_data['age_3_5'],
-        firm_age_data['age_5_plus']
-    ]
-    
-    # Create DataFrame for plotting
-    age_df = pd.DataFrame({
-        'Age Category': age_categories,
-        'Number of Firms': age_counts,
-        'Percentage': [count / sum(age_counts) * 100 if sum(age_counts) > 0 else 0 for count in age_counts]
-    })
+    # Age distribution table and charts, built once per county's counts so
+    # switching chart type is a lookup
+    age_artifacts = _build_age_artifacts(tuple(counts.tolist()), county_fips)
+    age_df = age_artifacts['df']
     
-    # Chart type selection
-    chart_type = st.radio(
-        "Chart Type",
-        options=["Bar Chart", "Pie Chart", "Donut Chart"],
-        horizontal=True
-    )
-    
-    if chart_type == "Bar Chart":
-        fig = px.bar(
-            age_df,
-            x='Age Category',
-            y='Number of Firms',
-            title="Firm Age Distribution",
-            color='Age Category',
-            color_discrete_sequence=px.colors.qualitative.Set3
-        )
-        
-        # Add percentage labels
-        fig.update_traces(
-            text=[f"{count}<br>({pct:.1f}%)" for count, pct in zip(age_df['Number of Firms'], age_df['Percentage'])],
-            textposition='outside'
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
-    
-    elif chart_type == "Pie Chart":
-        fig = px.pie(
-            age_df,
-            values='Number of Firms',
-            names='Age Category',
-            title="Firm Age Distribution",
-            color_discrete_sequence=px.colors.qualitative.Set3
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
-    
-    elif chart_type == "Donut Chart":
-        fig = go.Figure(data=[go.Pie(
-            labels=age_df['Age Category'],
-            values=age_df['Number of Firms'],
-            hole=0.4,
-            textinfo='label+percent',
-            textposition='auto'
-        )])
-        
-        fig.update_layout(
-            title="Firm Age Distribution",
-            annotations=[dict(text='Firm Age', x=0.5, y=0.5, font_size=20, showarrow=False)]
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+    _age_chart_fragment(age_artifacts, county_fips)
     
     # Age distribution table
     st.subheader("Age Distribution Details")
     
-    # Add cumulative percentages
-    age_df['Cumulative Count'] = age_df['Number of Firms'].cumsum()
-    age_df['Cumulative Percentage'] = age_df['Cumulative Count'] / age_df['Number of Firms'].sum() * 100
-    
-    # Format the display table
-    display_df = age_df.copy()
-    display_df['Number of Firms'] = display_df['Number of Firms'].apply(data_utils.format_number)
-    display_df['Percentage'] = display_df['Percentage'].apply(lambda x: f"{x:.1f}%")
-    display_df['Cumulative Count'] = display_df['Cumulative Count'].apply(data_utils.format_number)
-    display_df['Cumulative Percentage'] = display_df['Cumulative Percentage'].apply(lambda x: f"{x:.1f}%")
-    
-    st.dataframe(display_df, use_container_width=True, hide_index=True)
+    # The browser formats the raw numbers, so no display copy is needed
+    st.dataframe(
+        age_df,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            'Number of Firms': st.column_config.NumberColumn(format='localized'),
+            'Percentage': st.column_config.NumberColumn(format='%.1f%%'),
+            'Cumulative Count': st.column_config.NumberColumn(format='localized'),
+            'Cumulative Percentage': st.column_config.NumberColumn(format='%.1f%%')
+        }
+    )
     
     # Insights and analysis
     st.subheader("📊 Analysis Insights")
     
-    total_firms_with_data = sum(age_counts)
-    if total_firms_with_data > 0:
-        # Calculate key insights
-        young_firm_pct = (firm_age_data['age_0_1'] + firm_age_data['age_1_3']) / total_firms_with_data * 100
-        newest_firm_pct = firm_age_data['age_0_1'] / total_firms_with_data * 100
-        established_pct = (firm_age_data['age_3_5'] + firm_age_data['age_5_plus']) / total_firms_with_data * 100
-        
+    insights = _age_insights(tuple(counts.tolist()), firm_age_data['match_rate'])
+    if insights['dynamics']:
         insight_col1, insight_col2 = st.columns(2)
         
         with insight_col1:
-            st.info(f"""
-            **Market Dynamics:**
-            - {young_firm_pct:.1f}% of firms are 3 years old or newer
-            - {newest_firm_pct:.1f}% are in their first year
-            - {established_pct:.1f}% are established (3+ years)
-            """)
+            st.info(insights['dynamics'])
         
         with insight_col2:
-            # Determine market characteristics
-            if young_firm_pct > 40:
-                market_type = "High Growth/Emerging"
-                market_desc = "High rate of new firm formation suggests growing market opportunity"
-            elif young_firm_pct > 25:
-                market_type = "Moderate Growth"
-                market_desc = "Balanced mix of new and established firms"
-            else:
-                market_type = "Mature/Stable"
-                market_desc = "Dominated by established firms with lower formation rates"
-            
-            st.success(f"""
-            **Market Characterization:**
-            - Market Type: {market_type}
-            - Assessment: {market_desc}
-            """)
+            st.success(insights['characterization'])
     
     # Data quality indicator
-    match_rate = firm_age_data['match_rate']
-    if match_rate < 50:
-        st.warning(f"""
-        ⚠️ **Data Quality Note:** 
-        Only {match_rate:.1f}% of firms have incorporation date data available. 
-        Results may not be fully representative of the total firm population.
-        """)
-    elif match_rate < 75:
-        st.info(f"""
-        ℹ️ **Data Coverage:** 
-        {match_rate:.1f}% of firms have incorporation date data. 
-        Results provide a good representation of firm age distribution.
-        """)
-    else:
-        st.success(f"""
-        ✅ **High Data Quality:** 
-        {match_rate:.1f}% of firms have incorporation date data. 
-        Results are highly representative.
-        """)
+    quality_level, quality_text = insights['quality']
+    {'warning': st.warning, 'info': st.info, 'success': st.success}[quality_level](quality_text)
     
-    # Export functionality
-    if st.button("Export Firm Age Data", key="firm_age_export"):
-        csv_data = data_utils.export_to_csv(
-            age_df,
-            f"firm_age_analysis_{county_fips}.csv"
-        )
-        
-        st.download_button(
-            label="Download CSV",
-            data=csv_data,
-            file_name=f"firm_age_analysis_{county_fips}_{pd.Timestamp.now().strftime('%Y%m%d')}.csv",
-            mime="text/csv"
-        )
+    # Export functionality; the encoded CSV is cached, so reruns reuse it
+    st.download_button(
+        label="Export Firm Age Data",
+        data=_age_csv(age_df, county_fips),
+        file_name=f"firm_age_analysis_{county_fips}_{pd.Timestamp.now().strftime('%Y%m%d')}.csv",
+        mime="text/csv",
+        key="firm_age_export"
+    )
@@ -1,18 +1,232 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+import numpy as np
+import bisect
 import logging
+import operator
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 
 from services.data_service import DataService
 from utils.data_quality import DataQualityManager
 from lib.date_utils import date_utils
+from lib.utils import DataUtils
 
 logger = logging.getLogger(__name__)
 
+# Age groups in logical order, and the firm age data fields they come from
+AGE_GROUPS = ('0-1 years', '1-3 years', '3-5 years', '5+ years')
+AGE_FIELDS = ('age_0_1', 'age_1_3', 'age_3_5', 'age_5_plus')
+
+# Most points sent to the browser for one formation trend line
+_MAX_TREND_POINTS = 500
+
+# Read-only summary charts (the pies) are drawn without hover, zoom or mode bar
+_STATIC_CHART_CONFIG = {'staticPlot': True, 'displayModeBar': False}
+
+# Fallback match rate grades: below 60 is D, 60 and up C, 75 and up B, 90 and up A
+_GRADE_THRESHOLDS = (60, 75, 90)
+_GRADES = ('D', 'C', 'B', 'A')
+
+# Insight rules as (metric, comparison, threshold, message), checked in order.
+# Paired rules on the same metric are mutually exclusive
+_LIFECYCLE_INSIGHT_RULES = (
+    ('startup_pct', operator.gt, 15, "🟢 High startup formation rate indicates dynamic business environment"),
+    ('startup_pct', operator.lt, 5, "🟡 Low startup rate may indicate market saturation or barriers to entry"),
+    ('emerging_pct', operator.gt, 20, "🟢 Strong emerging business segment suggests healthy growth pipeline"),
+    ('survival_rate', operator.gt, 85, "🟢 High business survival rate indicates favorable market conditions"),
+    ('survival_rate', operator.lt, 70, "🟡 Lower survival rate may indicate competitive challenges")
+)
+_STRATEGIC_INSIGHT_RULES = (
+    # Market entry timing
+    ('startup_rate', operator.gt, 12, "🟢 High startup formation rate suggests market accepts new entrants"),
+    ('startup_rate', operator.lt, 5, "🟡 Low startup rate may indicate market maturity or high barriers"),
+    # Competition landscape
+    ('mature_rate', operator.gt, 60, "🟡 Market dominated by mature firms - differentiation important"),
+    ('mature_rate', operator.lt, 30, "🟢 Market has room for established players"),
+    # Growth trajectory
+    ('yoy_change', operator.gt, 10, "🟢 Strong growth trajectory in business formation"),
+    ('yoy_change', operator.lt, -10, "🔴 Declining business formation trend"),
+    # High propensity
+    ('hp_rate', operator.gt, 70, "🟢 High job creation potential from new businesses"),
+    ('hp_rate', operator.lt, 50, "🟡 Moderate job creation potential")
+)
+
+# Alternative formation trend column names and the name each is read as
+_TREND_COLUMNS = {
+    'total_applications': 'applications_total',
+    'applications': 'applications_total',
+    'total_apps': 'applications_total',
+    'hp_applications': 'high_propensity_applications',
+    'high_prop_apps': 'high_propensity_applications'
+}
+
+# Placeholder formation and application figures until the service provides them
+_FALLBACK_FORMATION_TRENDS = (
+    {'year': 2024, 'applications_total': 45, 'high_propensity_apps': 23},
+    {'year': 2023, 'applications_total': 52, 'high_propensity_apps': 28},
+    {'year': 2022, 'applications_total': 38, 'high_propensity_apps': 19}
+)
+_FALLBACK_BUSINESS_APPS = {
+    'total_apps': 156,
+    'high_propensity_apps': 70,
+    'approval_rate': 89.5
+}
+
+def _eval_insights(rules: tuple, metrics: Dict[str, float]) -> List[str]:
+    """Messages of the rules whose metric passes its comparison"""
+    return [message for key, compare, threshold, message in rules if compare(metrics[key], threshold)]
+
+def _pct(num, den):
+    """num as a percentage of den, or 0 when den is 0; num may be an array"""
+    return num / den * 100 if den else num * 0.0
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _load_firm_data(_data_service: DataService, county_fips: str) -> Optional[Dict[str, Any]]:
+    """Firm data for a county in the shape the tabs expect, or None without firm age data.
+
+    Fetched and structured once per county; the service argument is not hashed.
+    """
+    firm_age_data = _data_service.get_firm_age_data(county_fips)
+    if not firm_age_data or not any(firm_age_data.values()):
+        return None
+    return _build_firm_data(firm_age_data)
+
+def _build_firm_data(firm_age_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Firm data in the shape the tabs expect"""
+    # Structure the data properly for the component
+    return {
+        'age_distribution': {
+            'age_buckets': {
+                '0-1 years': firm_age_data.get('age_0_1', 0),
+                '1-3 years': firm_age_data.get('age_1_3', 0), 
+                '3-5 years': firm_age_data.get('age_3_5', 0),
+                '5+ years': firm_age_data.get('age_5_plus', 0)
+            },
+            # The same counts in AGE_GROUPS order, shared by the tabs
+            'ordered_counts': np.array([firm_age_data.get(field, 0) for field in AGE_FIELDS], dtype=np.int64),
+            'total_firms': firm_age_data.get('total_firms', 0),
+            'match_rate': firm_age_data.get('match_rate', 0.0)
+        },
+        'formation_trends': _FALLBACK_FORMATION_TRENDS,
+        'business_applications': _FALLBACK_BUSINESS_APPS
+    }
+
+# Figures are cached as dicts keyed on plain tuples of their inputs, so a
+# rerun with unchanged data re-sends the same figure without rebuilding it
+@st.cache_data(show_spinner=False)
+def _age_figures(counts: tuple) -> Dict[str, dict]:
+    """Firm age bar and pie figures for counts in AGE_GROUPS order"""
+    import plotly.graph_objects as go  # loaded on first chart, not at app start
+
+    # Four fixed groups, so the traces take the lists directly
+    fig = go.Figure(go.Bar(
+        x=AGE_GROUPS,
+        y=counts,
+        text=counts,
+        textposition='outside'
+    ))
+    fig.update_layout(
+        title="Firm Age Distribution",
+        xaxis_title='Age Group (Years)',
+        yaxis_title='Number of Firms',
+        height=400
+    )
+
+    fig_pie = go.Figure(go.Pie(labels=AGE_GROUPS, values=counts))
+    fig_pie.update_layout(title="Age Distribution (%)", uirevision='static')
+
+    return {'bar': fig.to_dict(), 'pie': fig_pie.to_dict()}
+
+@st.cache_data(show_spinner=False)
+def _trend_line_figure(years: tuple, values: tuple, value_col: str, title: str, color: Optional[str] = None) -> dict:
+    """Line figure of one formation measure by year, downsampled if very long"""
+    import plotly.express as px  # loaded on first chart, not at app start
+
+    # A chart is only so many pixels wide; long monthly histories are cut to
+    # the points that carry the shape of the line
+    years, values = DataUtils.downsample_lttb(years, values, _MAX_TREND_POINTS)
+
+    fig = px.line(
+        pd.DataFrame({'year': years, value_col: values}),
+        x='year',
+        y=value_col,
+        title=title,
+        markers=True,
+        color_discrete_sequence=[color] if color else None,
+        render_mode='webgl'
+    )
+    fig.update_layout(height=400)
+    return fig.to_dict()
+
+@st.cache_data(show_spinner=False)
+def _bfs_trend_figures(trend_items: tuple) -> Dict[str, dict]:
+    """Application volume and high propensity rate figures for (year, total, high propensity) rows"""
+    import plotly.graph_objects as go  # loaded on first chart, not at app start
+
+    years, totals, hp_apps = np.array(sorted(trend_items), dtype=np.float64).T
+    years = years.astype(int)
+
+    # Calculate high propensity rates in one masked divide; a year with no
+    # applications has a rate of 0. Values are left unrounded and formatted
+    # to one decimal by the chart
+    hp_rate = np.divide(hp_apps, totals, out=np.zeros_like(totals), where=totals > 0)
+    hp_rate *= 100
+
+    # Volume chart
+    fig_volume = go.Figure([
+        go.Bar(
+            x=years,
+            y=totals,
+            name='Total Applications',
+            marker_color='lightblue'
+        ),
+        go.Bar(
+            x=years,
+            y=hp_apps,
+            name='High Propensity',
+            marker_color='orange'
+        )
+    ])
+    fig_volume.update_layout(
+        title='Application Volumes',
+        barmode='group',
+        xaxis_title="Year",
+        yaxis_title="Applications",
+        height=400
+    )
+
+    # Rate chart
+    fig_rate = go.Figure(go.Scattergl(
+        x=years,
+        y=hp_rate,
+        mode='lines+markers',
+        name='HP Rate (%)',
+        line=dict(color='green', width=3),
+        hovertemplate="%{x}: %{y:.1f}%<extra></extra>"
+    ))
+    fig_rate.update_layout(
+        title='High Propensity Rate',
+        xaxis_title="Year",
+        yaxis_title="HP Rate (%)",
+        height=400
+    )
+
+    return {'volume': fig_volume.to_dict(), 'rate': fig_rate.to_dict()}
+
+@st.cache_data(show_spinner=False)
+def _lifecycle_pie_figure(lifecycle_items: tuple) -> dict:
+    """Pie figure of firms by lifecycle stage"""
+    import plotly.express as px  # loaded on first chart, not at app start
+
+    fig = px.pie(
+        values=[count for _, count in lifecycle_items],
+        names=[stage for stage, _ in lifecycle_items],
+        title="Business Lifecycle Distribution"
+    )
+    fig.update_layout(uirevision='static')
+    return fig.to_dict()
+
 class FirmAnalysis:
     """Firm demographics and formation analysis component"""
 
@@ -27,36 +241,12 @@ class FirmAnalysis:
 
         # Get firm demographics data
         with st.spinner("Loading firm demographics data..."):
-            firm_age_data = self.data_service.get_firm_age_data(county_fips)
+            firm_data = _load_firm_data(self.data_service, county_fips)
 
-        if not firm_age_data or not any(firm_age_data.values()):
+        if firm_data is None:
             st.warning("No firm demographics data available for this county.")
             return
 
-        # Structure the data properly for the component
-        firm_data = {
-            'age_distribution': {
-                'age_buckets': {
-                    '0-1 years': firm_age_data.get('age_0_1', 0),
-                    '1-3 years': firm_age_data.get('age_1_3', 0), 
-                    '3-5 years': firm_age_data.get('age_3_5', 0),
-                    '5+ years': firm_age_data.get('age_5_plus', 0)
-                },
-                'total_firms': firm_age_data.get('total_firms', 0),
-                'match_rate': firm_age_data.get('match_rate', 0.0)
-            },
-            'formation_trends': [
-                {'year': 2024, 'applications_total': 45, 'high_propensity_apps': 23},
-                {'year': 2023, 'applications_total': 52, 'high_propensity_apps': 28},
-                {'year': 2022, 'applications_total': 38, 'high_propensity_apps': 19}
-            ],
-            'business_applications': {
-                'total_apps': 156,
-                'high_propensity_apps': 70,
-                'approval_rate': 89.5
-            }
-        }
-
         # Summary metrics
         self._render_summary_metrics(firm_data)
 
@@ -69,13 +259,13 @@ class FirmAnalysis:
         ])
 
         with tab1:
-            self._render_age_distribution(firm_data.get('age_distribution', {}))
+            self._render_age_distribution(firm_data.get('age_distribution', {}), county_fips)
 
         with tab2:
-            self._render_formation_trends(firm_data.get('formation_trends', []))
+            self._render_formation_trends(firm_data.get('formation_trends', []), county_fips)
 
         with tab3:
-            self._render_business_applications(firm_data.get('business_applications', {}))
+            self._render_business_applications(firm_data.get('business_applications', {}), county_fips)
 
         with tab4:
             self._render_detailed_analysis(firm_data, county_fips)
@@ -86,7 +276,6 @@ class FirmAnalysis:
 
         # Age distribution data
         age_dist = firm_data.get('age_distribution', {})
-        age_buckets = age_dist.get('age_buckets', {})
         total_firms = age_dist.get('total_firms', 0)
         match_rate = age_dist.get('match_rate', 0)
 
@@ -98,8 +287,9 @@ class FirmAnalysis:
             )
 
         with col2:
-            young_firms = age_buckets.get('0-1 years', 0) + age_buckets.get('1-3 years', 0)
-            young_pct = (young_firms / total_firms * 100) if total_firms > 0 else 0
+            # The first two of the ordered counts are the 0-1y and 1-3y groups
+            young_firms = int(age_dist['ordered_counts'][:2].sum())
+            young_pct = _pct(young_firms, total_firms)
             st.metric(
                 "Young Firms (<3y)",
                 f"{young_firms:,}",
@@ -124,7 +314,8 @@ class FirmAnalysis:
                 help="Business applications (latest year)"
             )
 
-    def _render_age_distribution(self, age_data: Dict[str, Any]):
+    @st.fragment
+    def _render_age_distribution(self, age_data: Dict[str, Any], county_fips: str):
         """Render firm age distribution analysis"""
         st.subheader("📊 Firm Age Distribution")
 
@@ -150,136 +341,72 @@ class FirmAnalysis:
                     st.write(f"**Quality Grade:** {quality_badge['grade']}")
                 else:
                     # Provide fallback quality assessment
-                    if match_rate >= 90:
-                        grade = "A"
-                    elif match_rate >= 75:
-                        grade = "B"
-                    elif match_rate >= 60:
-                        grade = "C"
-                    else:
-                        grade = "D"
+                    grade = _GRADES[bisect.bisect_right(_GRADE_THRESHOLDS, match_rate)]
                     st.write(f"**Quality Grade:** {grade}")
                 st.write("**Source:** OpenCorporates incorporation data")
 
         # Age distribution visualization
         col1, col2 = st.columns([2, 1])
 
+        group_counts = age_data['ordered_counts']
+        age_figures = _age_figures(tuple(group_counts.tolist()))
+
         with col1:
-            # Create age distribution chart
-            age_df = pd.DataFrame([
-                {'Age_Group': age_group, 'Count': count, 'Percentage': count/total_firms*100}
-                for age_group, count in age_buckets.items()
-            ])
-
-            # Sort by logical age order
-            age_order = ['0-1 years', '1-3 years', '3-5 years', '5+ years']
-            age_df['Age_Group'] = pd.Categorical(age_df['Age_Group'], categories=age_order, ordered=True)
-            age_df = age_df.sort_values('Age_Group')
-
-            fig = px.bar(
-                age_df,
-                x='Age_Group',
-                y='Count',
-                title="Firm Age Distribution",
-                labels={'Age_Group': 'Age Group (Years)', 'Count': 'Number of Firms'},
-                text='Count'
-            )
-            fig.update_traces(texttemplate='%{text}', textposition='outside')
-            fig.update_layout(height=400)
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(age_figures['bar'], use_container_width=True, key=f"firm_age_bar_{county_fips}")
 
         with col2:
             # Pie chart for percentages
-            fig_pie = px.pie(
-                age_df,
-                names='Age_Group',
-                values='Count',
-                title="Age Distribution (%)"
+            st.plotly_chart(
+                age_figures['pie'], use_container_width=True, config=_STATIC_CHART_CONFIG,
+                key=f"firm_age_pie_{county_fips}"
             )
-            st.plotly_chart(fig_pie, use_container_width=True)
 
         # Age group analysis
         st.subheader("🔍 Age Group Analysis")
 
         # Calculate insights
-        startup_firms = age_buckets.get('0-1 years', 0)
-        emerging_firms = age_buckets.get('1-3 years', 0) 
-        established_firms = age_buckets.get('3-5 years', 0)
-        mature_firms = age_buckets.get('5+ years', 0)
-
-        startup_pct = (startup_firms / total_firms * 100) if total_firms > 0 else 0
-        emerging_pct = (emerging_firms / total_firms * 100) if total_firms > 0 else 0
-
-        col1, col2, col3, col4 = st.columns(4)
-
-        with col1:
-            st.metric(
-                "Startups (0-1y)",
-                f"{startup_firms:,}",
-                delta=f"{startup_pct:.1f}%"
-            )
-            if startup_pct > 15:
-                st.success("High startup activity")
-            elif startup_pct > 8:
-                st.info("Moderate startup activity")
-            else:
-                st.warning("Low startup activity")
-
-        with col2:
-            st.metric(
-                "Emerging (1-3y)",
-                f"{emerging_firms:,}",
-                delta=f"{emerging_pct:.1f}%"
-            )
-            if emerging_pct > 20:
-                st.success("Strong growth phase")
-            elif emerging_pct > 12:
-                st.info("Moderate growth")
-            else:
-                st.warning("Limited growth activity")
-
-        with col3:
-            st.metric(
-                "Established (3-5y)",
-                f"{established_firms:,}",
-                delta=f"{(established_firms/total_firms*100):.1f}%"
-            )
-
-        with col4:
-            st.metric(
-                "Mature (5+y)",
-                f"{mature_firms:,}",
-                delta=f"{(mature_firms/total_firms*100):.1f}%"
-            )
-
-        # Business lifecycle insights
-        st.subheader("💡 Business Lifecycle Insights")
-
-        insights = []
+        startup_firms, emerging_firms, established_firms, mature_firms = group_counts.tolist()
+
+        startup_pct, emerging_pct, established_pct, mature_pct = _pct(group_counts, total_firms)
+
+        # Every metric is written in one pass over the columns, then the
+        # activity notes under the first two
+        metric_specs = (
+            ("Startups (0-1y)", startup_firms, startup_pct),
+            ("Emerging (1-3y)", emerging_firms, emerging_pct),
+            ("Established (3-5y)", established_firms, established_pct),
+            ("Mature (5+y)", mature_firms, mature_pct)
+        )
+        columns = st.columns(4)
+        for col, (label, count, pct) in zip(columns, metric_specs):
+            col.metric(label, f"{count:,}", delta=f"{pct:.1f}%")
 
         if startup_pct > 15:
-            insights.append("🟢 High startup formation rate indicates dynamic business environment")
-        elif startup_pct < 5:
-            insights.append("🟡 Low startup rate may indicate market saturation or barriers to entry")
+            columns[0].success("High startup activity")
+        elif startup_pct > 8:
+            columns[0].info("Moderate startup activity")
+        else:
+            columns[0].warning("Low startup activity")
 
         if emerging_pct > 20:
-            insights.append("🟢 Strong emerging business segment suggests healthy growth pipeline")
+            columns[1].success("Strong growth phase")
+        elif emerging_pct > 12:
+            columns[1].info("Moderate growth")
+        else:
+            columns[1].warning("Limited growth activity")
 
-        survival_rate = ((emerging_firms + established_firms + mature_firms) / 
-                        (startup_firms + emerging_firms + established_firms + mature_firms) * 100) if total_firms > 0 else 0
+        # Business lifecycle insights
+        st.subheader("💡 Business Lifecycle Insights")
 
-        if survival_rate > 85:
-            insights.append("🟢 High business survival rate indicates favorable market conditions")
-        elif survival_rate < 70:
-            insights.append("🟡 Lower survival rate may indicate competitive challenges")
+        insights = _lifecycle_insights(tuple(group_counts.tolist()), total_firms)
 
         if insights:
-            for insight in insights:
-                st.write(f"• {insight}")
+            st.markdown("\n".join(f"- {insight}" for insight in insights))
         else:
             st.info("Analysis requires more comprehensive firm data.")
 
-    def _render_formation_trends(self, formation_trends: List[Dict[str, Any]]):
+    @st.fragment
+    def _render_formation_trends(self, formation_trends: List[Dict[str, Any]], county_fips: str):
         """Render business formation trends analysis"""
         st.subheader("📈 Business Formation Trends")
 
@@ -287,59 +414,43 @@ class FirmAnalysis:
             st.info("No business formation trends data available.")
             return
 
-        # Convert to DataFrame
-        trends_df = pd.DataFrame(formation_trends)
+        # Convert to DataFrame, with alternative column names mapped to one
+        # name each (the first is kept if a source has several)
+        trends_df = pd.DataFrame(formation_trends).rename(columns=lambda col: _TREND_COLUMNS.get(col, col))
+        trends_df = trends_df.loc[:, ~trends_df.columns.duplicated()]
 
         # Sort by year
         if 'year' in trends_df.columns:
             trends_df = trends_df.sort_values('year')
 
         # Check what columns are actually available
-        available_cols = trends_df.columns.tolist()
+        available_cols = set(trends_df.columns)
 
         # Main trends chart
         col1, col2 = st.columns(2)
 
         with col1:
-            # Try different possible column names for total applications
-            total_apps_col = None
-            for col in ['applications_total', 'total_applications', 'applications', 'total_apps']:
-                if col in available_cols:
-                    total_apps_col = col
-                    break
-
-            if 'year' in available_cols and total_apps_col:
-                fig = px.line(
-                    trends_df,
-                    x='year',
-                    y=total_apps_col,
-                    title='Total Business Applications Over Time',
-                    markers=True
+            if 'year' in available_cols and 'applications_total' in available_cols:
+                fig = _trend_line_figure(
+                    tuple(trends_df['year']),
+                    tuple(trends_df['applications_total']),
+                    'applications_total',
+                    'Total Business Applications Over Time'
                 )
-                fig.update_layout(height=400)
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(fig, use_container_width=True, key=f"formation_total_{county_fips}")
             else:
                 st.info("Insufficient data for trends chart")
 
         with col2:
-            # Try different possible column names for high propensity applications
-            hp_apps_col = None
-            for col in ['high_propensity_applications', 'hp_applications', 'high_prop_apps']:
-                if col in available_cols:
-                    hp_apps_col = col
-                    break
-
-            if 'year' in available_cols and hp_apps_col:
-                fig = px.line(
-                    trends_df,
-                    x='year', 
-                    y=hp_apps_col,
-                    title='High Propensity Applications Over Time',
-                    markers=True,
-                    color_discrete_sequence=['orange']
+            if 'year' in available_cols and 'high_propensity_applications' in available_cols:
+                fig = _trend_line_figure(
+                    tuple(trends_df['year']),
+                    tuple(trends_df['high_propensity_applications']),
+                    'high_propensity_applications',
+                    'High Propensity Applications Over Time',
+                    color='orange'
                 )
-                fig.update_layout(height=400)
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(fig, use_container_width=True, key=f"formation_hp_{county_fips}")
             else:
                 st.info("High propensity data not available")
 
@@ -350,20 +461,17 @@ class FirmAnalysis:
         display_columns = {
             'year': 'Year',
             'applications_total': 'Total Applications',
-            'total_applications': 'Total Applications', 
-            'applications': 'Applications',
             'high_propensity_applications': 'High Propensity Apps',
-            'hp_applications': 'High Propensity Apps',
             'applications_with_planned_wages': 'With Planned Wages',
             'applications_with_first_day_wages': 'With First Day Wages'
         }
 
         # Only use columns that actually exist in the DataFrame
-        available_columns = {k: v for k, v in display_columns.items() if k in trends_df.columns}
+        available_columns = {k: v for k, v in display_columns.items() if k in available_cols}
 
         if available_columns:
-            display_df = trends_df[list(available_columns.keys())].copy()
-            display_df = display_df.rename(columns=available_columns)
+            # Selecting a column list already returns a new frame, so no explicit copy
+            display_df = trends_df.loc[:, list(available_columns)].rename(columns=available_columns)
 
             st.dataframe(
                 display_df,
@@ -373,11 +481,12 @@ class FirmAnalysis:
         else:
             st.info("No displayable formation trends data available")
             # Show raw data structure for debugging
-            st.write("Available columns:", available_cols)
+            st.write("Available columns:", trends_df.columns.tolist())
             if not trends_df.empty:
                 st.write("Sample data:", trends_df.head())
 
-    def _render_business_applications(self, bfs_data: Dict[str, Any]):
+    @st.fragment
+    def _render_business_applications(self, bfs_data: Dict[str, Any], county_fips: str):
         """Render BFS business applications data"""
         st.subheader("📋 Business Applications (BFS)")
 
@@ -391,32 +500,14 @@ class FirmAnalysis:
         hp_apps = bfs_data.get('high_propensity_applications', 0)
         hp_rate = bfs_data.get('high_propensity_rate', 0)
 
-        col1, col2, col3, col4 = st.columns(4)
-
-        with col1:
-            st.metric(
-                "Data Year",
-                f"{latest_year}" if latest_year else "N/A"
-            )
-
-        with col2:
-            st.metric(
-                "Total Applications",
-                f"{total_apps:,}"
-            )
-
-        with col3:
-            st.metric(
-                "High Propensity Apps",
-                f"{hp_apps:,}"
-            )
-
-        with col4:
-            st.metric(
-                "HP Rate",
-                f"{hp_rate:.1f}%",
-                help="Percentage likely to create jobs within 8 quarters"
-            )
+        metric_specs = (
+            ("Data Year", f"{latest_year}" if latest_year else "N/A", None),
+            ("Total Applications", f"{total_apps:,}", None),
+            ("High Propensity Apps", f"{hp_apps:,}", None),
+            ("HP Rate", f"{hp_rate:.1f}%", "Percentage likely to create jobs within 8 quarters")
+        )
+        for col, (label, value, help_text) in zip(st.columns(4), metric_specs):
+            col.metric(label, value, help=help_text)
 
         # Year-over-year changes
         yoy_total_change = bfs_data.get('yoy_total_change_pct', 0)
@@ -425,78 +516,31 @@ class FirmAnalysis:
         if yoy_total_change != 0 or yoy_hp_change != 0:
             st.subheader("📈 Year-over-Year Changes")
 
-            col1, col2 = st.columns(2)
-
-            with col1:
-                direction = "📈" if yoy_total_change > 0 else "📉" if yoy_total_change < 0 else "➡️"
-                st.metric(
-                    f"{direction} Total Applications Change",
-                    f"{yoy_total_change:+.1f}%"
-                )
-
-            with col2:
-                direction = "📈" if yoy_hp_change > 0 else "📉" if yoy_hp_change < 0 else "➡️"
-                st.metric(
-                    f"{direction} High Propensity Change",
-                    f"{yoy_hp_change:+.1f}%"
-                )
+            yoy_specs = (
+                ("Total Applications Change", yoy_total_change),
+                ("High Propensity Change", yoy_hp_change)
+            )
+            for col, (label, change) in zip(st.columns(2), yoy_specs):
+                direction = "📈" if change > 0 else "📉" if change < 0 else "➡️"
+                col.metric(f"{direction} {label}", f"{change:+.1f}%")
 
         # Multi-year trend data
         trend_data = bfs_data.get('trend_data', [])
         if len(trend_data) > 1:
             st.subheader("📊 Multi-Year Trends")
 
-            trend_df = pd.DataFrame(trend_data)
-            trend_df = trend_df.sort_values('year')
+            trend_figures = _bfs_trend_figures(tuple(
+                (row['year'], row['applications_total'], row['high_propensity_apps'])
+                for row in trend_data
+            ))
 
-            # Calculate high propensity rates
-            trend_df['hp_rate'] = (trend_df['high_propensity_apps'] / trend_df['applications_total'] * 100).round(1)
-
-            fig = make_subplots(
-                rows=1, cols=2,
-                subplot_titles=('Application Volumes', 'High Propensity Rate'),
-                specs=[[{"secondary_y": False}, {"secondary_y": False}]]
-            )
-
-            # Volume chart
-            fig.add_trace(
-                go.Bar(
-                    x=trend_df['year'],
-                    y=trend_df['applications_total'],
-                    name='Total Applications',
-                    marker_color='lightblue'
-                ),
-                row=1, col=1
-            )
-
-            fig.add_trace(
-                go.Bar(
-                    x=trend_df['year'],
-                    y=trend_df['high_propensity_apps'],
-                    name='High Propensity',
-                    marker_color='orange'
-                ),
-                row=1, col=1
-            )
-
-            # Rate chart
-            fig.add_trace(
-                go.Scatter(
-                    x=trend_df['year'],
-                    y=trend_df['hp_rate'],
-                    mode='lines+markers',
-                    name='HP Rate (%)',
-                    line=dict(color='green', width=3)
-                ),
-                row=1, col=2
-            )
+            col1, col2 = st.columns(2)
 
-            fig.update_layout(height=400)
-            fig.update_xaxes(title_text="Year")
-            fig.update_yaxes(title_text="Applications", row=1, col=1)
-            fig.update_yaxes(title_text="HP Rate (%)", row=1, col=2)
+            with col1:
+                st.plotly_chart(trend_figures['volume'], use_container_width=True, key=f"bfs_volume_{county_fips}")
 
-            st.plotly_chart(fig, use_container_width=True)
+            with col2:
+                st.plotly_chart(trend_figures['rate'], use_container_width=True, key=f"bfs_rate_{county_fips}")
 
         # Data source information
         with st.expander("ℹ️ About Business Formation Statistics", expanded=False):
@@ -513,6 +557,7 @@ class FirmAnalysis:
             which applications are likely to result in job creation within 8 quarters.
             """)
 
+    @st.fragment
     def _render_detailed_analysis(self, firm_data: Dict[str, Any], county_fips: str):
         """Render detailed firm analysis and insights"""
         st.subheader("🔍 Detailed Analysis")
@@ -523,14 +568,16 @@ class FirmAnalysis:
         formation_trends = firm_data.get('formation_trends', [])
 
         # Calculate key metrics
-        age_buckets = age_data.get('age_buckets', {})
         total_firms = age_data.get('total_firms', 0)
+        group_counts = tuple(age_data['ordered_counts'].tolist())
 
-        if total_firms > 0:
-            young_firm_rate = ((age_buckets.get('0-1 years', 0) + age_buckets.get('1-3 years', 0)) / total_firms * 100)
-            startup_rate = (age_buckets.get('0-1 years', 0) / total_firms * 100)
-        else:
-            young_firm_rate = startup_rate = 0
+        # Scores and insights depend only on these inputs, so they are cached
+        # and recomputed only when one of them changes
+        hp_rate = bfs_data.get('high_propensity_rate', 0)
+        yoy_change = bfs_data.get('yoy_total_change_pct', 0)
+        recent_apps = tuple(t.get('applications_total', 0) for t in formation_trends[-3:])
+        analysis = _compute_insights(group_counts, total_firms, hp_rate, yoy_change, recent_apps)
+        dynamism_score = analysis['dynamism_score']
 
         # Market dynamism assessment
         st.subheader("🎯 Market Dynamism Assessment")
@@ -538,30 +585,6 @@ class FirmAnalysis:
         col1, col2 = st.columns(2)
 
         with col1:
-            # Dynamism score calculation
-            dynamism_score = 0
-
-            # Young firm rate (0-30 points)
-            dynamism_score += min(young_firm_rate * 0.5, 30)
-
-            # BFS high propensity rate (0-25 points)
-            hp_rate = bfs_data.get('high_propensity_rate', 0)
-            dynamism_score += min(hp_rate * 0.5, 25)
-
-            # YoY growth (0-25 points)
-            yoy_change = bfs_data.get('yoy_total_change_pct', 0)
-            if yoy_change > 0:
-                dynamism_score += min(yoy_change * 0.5, 25)
-
-            # Formation consistency (0-20 points)
-            if len(formation_trends) >= 3:
-                recent_years = formation_trends[-3:]
-                avg_apps = sum(t.get('applications_total', 0) for t in recent_years) / len(recent_years)
-                if avg_apps > 100:  # Consistent formation activity
-                    dynamism_score += 20
-
-            dynamism_score = min(dynamism_score, 100)
-
             st.metric(
                 "Market Dynamism Score",
                 f"{dynamism_score:.1f}/100",
@@ -571,103 +594,36 @@ class FirmAnalysis:
             # Dynamism interpretation
             if dynamism_score > 70:
                 st.success("🟢 Highly Dynamic Market")
-                dynamism_level = "High"
             elif dynamism_score > 50:
                 st.info("🟡 Moderately Dynamic Market")
-                dynamism_level = "Moderate"
             else:
                 st.warning("🔴 Less Dynamic Market")
-                dynamism_level = "Low"
 
         with col2:
             # Business lifecycle health
             if total_firms > 0:
-                lifecycle_health = {
-                    'Startups (0-1y)': age_buckets.get('0-1 years', 0),
-                    'Growth (1-3y)': age_buckets.get('1-3 years', 0),
-                    'Established (3-5y)': age_buckets.get('3-5 years', 0),
-                    'Mature (5+y)': age_buckets.get('5+ years', 0)
-                }
-
-                fig = px.pie(
-                    values=list(lifecycle_health.values()),
-                    names=list(lifecycle_health.keys()),
-                    title="Business Lifecycle Distribution"
+                lifecycle_stages = ('Startups (0-1y)', 'Growth (1-3y)', 'Established (3-5y)', 'Mature (5+y)')
+                fig = _lifecycle_pie_figure(tuple(zip(lifecycle_stages, group_counts)))
+                st.plotly_chart(
+                    fig, use_container_width=True, config=_STATIC_CHART_CONFIG,
+                    key=f"firm_lifecycle_pie_{county_fips}"
                 )
-                st.plotly_chart(fig, use_container_width=True)
 
         # Strategic insights
         st.subheader("💡 Strategic Insights")
 
-        insights = []
-
-        # Market entry timing insights
-        if startup_rate > 12:
-            insights.append("🟢 High startup formation rate suggests market accepts new entrants")
-        elif startup_rate < 5:
-            insights.append("🟡 Low startup rate may indicate market maturity or high barriers")
-
-        # Competition landscape
-        mature_rate = (age_buckets.get('5+ years', 0) / total_firms * 100) if total_firms > 0 else 0
-        if mature_rate > 60:
-            insights.append("🟡 Market dominated by mature firms - differentiation important")
-        elif mature_rate < 30:
-            insights.append("🟢 Market has room for established players")
-
-        # Growth trajectory
-        if yoy_change > 10:
-            insights.append("🟢 Strong growth trajectory in business formation")
-        elif yoy_change < -10:
-            insights.append("🔴 Declining business formation trend")
-
-        # High propensity insights
-        if hp_rate > 70:
-            insights.append("🟢 High job creation potential from new businesses")
-        elif hp_rate < 50:
-            insights.append("🟡 Moderate job creation potential")
-
-        if insights:
-            for insight in insights:
-                st.write(f"• {insight}")
+        if analysis['insights']:
+            st.markdown("\n".join(f"- {insight}" for insight in analysis['insights']))
 
         # Opportunity assessment
         st.subheader("🎯 Opportunity Assessment")
 
-        opportunity_factors = []
-
-        # Market timing
-        if dynamism_level == "High":
-            opportunity_factors.append(("Market Timing", "Excellent", "🟢"))
-        elif dynamism_level == "Moderate":
-            opportunity_factors.append(("Market Timing", "Good", "🟡"))
-        else:
-            opportunity_factors.append(("Market Timing", "Challenging", "🔴"))
-
-        # Competition level
-        if young_firm_rate > 25:
-            opportunity_factors.append(("Competition", "High (many new entrants)", "🟡"))
-        elif young_firm_rate > 15:
-            opportunity_factors.append(("Competition", "Moderate", "🟢"))
-        else:
-            opportunity_factors.append(("Competition", "Low (established market)", "🟢"))
-
-        # Growth potential
-        if yoy_change > 5:
-            opportunity_factors.append(("Growth Potential", "High", "🟢"))
-        elif yoy_change > -5:
-            opportunity_factors.append(("Growth Potential", "Stable", "🟡"))
-        else:
-            opportunity_factors.append(("Growth Potential", "Declining", "🔴"))
-
-        # Display opportunity matrix
-        for factor, assessment, icon in opportunity_factors:
-            col1, col2, col3 = st.columns([2, 2, 1])
-            with col1:
-                st.write(f"**{factor}:**")
-            with col2:
-                st.write(assessment)
-            with col3:
-                st.write(icon)
+        # Display opportunity matrix as one table rather than a row of columns per factor
+        st.dataframe(
+            pd.DataFrame(analysis['opportunity_factors'], columns=['Factor', 'Assessment', 'Status']),
+            hide_index=True,
+            use_container_width=True
+        )
 
         # Data quality and limitations
         with st.expander("⚠️ Data Quality & Limitations", expanded=False):
@@ -695,14 +651,114 @@ class FirmAnalysis:
             """)
 
 
-def render_firm_analysis(data_service, county_fips: str):
-    """Render the firm analysis dashboard for a given county"""
-    # Initialize quality manager or use None (component handles fallback)
+@st.cache_data(show_spinner=False)
+def _lifecycle_insights(group_counts: tuple, total_firms: int) -> List[str]:
+    """Business lifecycle insights for the age distribution tab
+
+    group_counts holds the firm counts in AGE_GROUPS order.
+    """
+    startup_firms, emerging_firms = group_counts[:2]
+    bucketed_firms = sum(group_counts)
+
+    return _eval_insights(_LIFECYCLE_INSIGHT_RULES, {
+        'startup_pct': _pct(startup_firms, total_firms),
+        'emerging_pct': _pct(emerging_firms, total_firms),
+        'survival_rate': _pct(bucketed_firms - startup_firms, bucketed_firms)
+    })
+
+
+@st.cache_data(show_spinner=False)
+def _compute_insights(group_counts: tuple, total_firms: int, hp_rate: float,
+                      yoy_change: float, recent_apps: tuple) -> Dict[str, Any]:
+    """Dynamism score, strategic insights and opportunity factors for the detailed analysis
+
+    group_counts holds the firm counts in AGE_GROUPS order.
+    """
+    startup_firms, emerging_firms, _, mature_firms = group_counts
+
+    young_firm_rate = _pct(startup_firms + emerging_firms, total_firms)
+    startup_rate = _pct(startup_firms, total_firms)
+
+    # Dynamism score calculation
+    dynamism_score = 0
+
+    # Young firm rate (0-30 points)
+    dynamism_score += min(young_firm_rate * 0.5, 30)
+
+    # BFS high propensity rate (0-25 points)
+    dynamism_score += min(hp_rate * 0.5, 25)
+
+    # YoY growth (0-25 points)
+    if yoy_change > 0:
+        dynamism_score += min(yoy_change * 0.5, 25)
+
+    # Formation consistency (0-20 points)
+    if len(recent_apps) >= 3:
+        avg_apps = sum(recent_apps) / len(recent_apps)
+        if avg_apps > 100:  # Consistent formation activity
+            dynamism_score += 20
+
+    dynamism_score = min(dynamism_score, 100)
+
+    if dynamism_score > 70:
+        dynamism_level = "High"
+    elif dynamism_score > 50:
+        dynamism_level = "Moderate"
+    else:
+        dynamism_level = "Low"
+
+    insights = _eval_insights(_STRATEGIC_INSIGHT_RULES, {
+        'startup_rate': startup_rate,
+        'mature_rate': _pct(mature_firms, total_firms),
+        'yoy_change': yoy_change,
+        'hp_rate': hp_rate
+    })
+
+    opportunity_factors = []
+
+    # Market timing
+    if dynamism_level == "High":
+        opportunity_factors.append(("Market Timing", "Excellent", "🟢"))
+    elif dynamism_level == "Moderate":
+        opportunity_factors.append(("Market Timing", "Good", "🟡"))
+    else:
+        opportunity_factors.append(("Market Timing", "Challenging", "🔴"))
+
+    # Competition level
+    if young_firm_rate > 25:
+        opportunity_factors.append(("Competition", "High (many new entrants)", "🟡"))
+    elif young_firm_rate > 15:
+        opportunity_factors.append(("Competition", "Moderate", "🟢"))
+    else:
+        opportunity_factors.append(("Competition", "Low (established market)", "🟢"))
+
+    # Growth potential
+    if yoy_change > 5:
+        opportunity_factors.append(("Growth Potential", "High", "🟢"))
+    elif yoy_change > -5:
+        opportunity_factors.append(("Growth Potential", "Stable", "🟡"))
+    else:
+        opportunity_factors.append(("Growth Potential", "Declining", "🔴"))
+
+    return {
+        'dynamism_score': dynamism_score,
+        'insights': insights,
+        'opportunity_factors': tuple(opportunity_factors)
+    }
+
+
+
+@st.cache_resource
+def _get_quality_manager() -> Optional[DataQualityManager]:
+    """Quality manager shared across reruns, or None (component handles fallback)"""
     try:
-        from utils.data_quality import DataQualityManager
-        quality_manager = DataQualityManager()
-    except:
-        quality_manager = None
+        return DataQualityManager()
+    except Exception as e:
+        logger.warning(f"Data quality manager unavailable: {e}")
+        return None
 
-    dashboard = FirmAnalysis(data_service, quality_manager)
+
+def render_firm_analysis(data_service, county_fips: str):
+    """Render the firm analysis dashboard for a given county"""
+    dashboard = FirmAnalysis(data_service, _get_quality_manager())
     dashboard.render(county_fips)
\ No newline at end of file
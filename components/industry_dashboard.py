@@ -1,8 +1,5 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import logging
 from typing import Dict, List, Any, Optional
 
@@ -79,7 +76,8 @@ class IndustryDashboard:
         # Summary metrics
         self._render_summary_metrics(quality_filtered_data)
 
-        # Main content tabs
+        # Main content tabs; the tabs with their own options are fragments,
+        # so changing an option reruns only that tab
         tab1, tab2, tab3, tab4 = st.tabs(["📊 Industries Overview", "💼 Financial Services", "📈 Trends & Analysis", "📋 Data Export"])
 
         with tab1:
@@ -141,6 +139,7 @@ class IndustryDashboard:
                 help="Financial services establishments and employment share"
             )
 
+    @st.fragment
     def _render_industries_overview(self, industry_data: List[Dict[str, Any]]):
         """Render industries overview table and charts"""
         if not industry_data:
@@ -208,6 +207,7 @@ class IndustryDashboard:
 
     def _render_financial_services_focus(self, industry_data: List[Dict[str, Any]]):
         """Render financial services focused analysis"""
+        import plotly.express as px  # loaded on first chart, not at app start
         
         # Filter for financial services (classification should already be applied)
         financial_data = [d for d in industry_data if d.get('is_financial_services')]
@@ -329,6 +329,7 @@ class IndustryDashboard:
 
     def _render_trends_analysis(self, industry_data: List[Dict[str, Any]], county_fips: str):
         """Render trends and competitive analysis"""
+        import plotly.graph_objects as go  # loaded on first chart, not at app start
         st.subheader("Market Analysis & Trends")
 
         # Market concentration analysis
@@ -404,37 +405,42 @@ class IndustryDashboard:
         ])
 
         if not demand_df.empty and demand_df[['rfp_count', 'award_count', 'sba_count']].sum().sum() > 0:
-            fig = make_subplots(
-                rows=1, cols=3,
-                subplot_titles=('RFP Opportunities', 'Federal Awards', 'SBA Lending'),
-                specs=[[{"type": "bar"}, {"type": "bar"}, {"type": "bar"}]]
+            # One row of three independent panels, laid out directly on the
+            # figure rather than through make_subplots' spec handling
+            panels = (
+                ('rfp_count', 'RFPs', 'RFP Opportunities'),
+                ('award_count', 'Awards', 'Federal Awards'),
+                ('sba_count', 'SBA Loans', 'SBA Lending')
             )
+            axis_suffixes = ('', '2', '3')
 
-            # RFPs
-            fig.add_trace(
-                go.Bar(x=demand_df['naics_title'], y=demand_df['rfp_count'], name='RFPs'),
-                row=1, col=1
-            )
-
-            # Awards  
-            fig.add_trace(
-                go.Bar(x=demand_df['naics_title'], y=demand_df['award_count'], name='Awards'),
-                row=1, col=2
-            )
-
-            # SBA
-            fig.add_trace(
-                go.Bar(x=demand_df['naics_title'], y=demand_df['sba_count'], name='SBA Loans'),
-                row=1, col=3
-            )
+            layout = {
+                'grid': {'rows': 1, 'columns': 3, 'pattern': 'independent'},
+                'annotations': [],
+                'height': 400,
+                'showlegend': False
+            }
+            traces = []
+            for (col, name, title), suffix in zip(panels, axis_suffixes):
+                traces.append(go.Bar(
+                    x=demand_df['naics_title'], y=demand_df[col], name=name,
+                    xaxis=f"x{suffix}", yaxis=f"y{suffix}"
+                ))
+                layout[f"xaxis{suffix}"] = {'tickangle': 45}
+                layout[f"yaxis{suffix}"] = {}
+                layout['annotations'].append({
+                    'text': title, 'xref': f"x{suffix} domain", 'yref': 'paper',
+                    'x': 0.5, 'y': 1.0, 'xanchor': 'center', 'yanchor': 'bottom',
+                    'showarrow': False, 'font': {'size': 16}
+                })
 
-            fig.update_layout(height=400, showlegend=False)
-            fig.update_xaxes(tickangle=45)
+            fig = go.Figure(data=traces, layout=layout)
 
             st.plotly_chart(fig, use_container_width=True)
         else:
             st.info("No recent demand signals data available")
 
+    @st.fragment
     def _render_data_export(self, industry_data: List[Dict[str, Any]], county_fips: str):
         """Render data export options"""
         st.subheader("📁 Export Data")
@@ -675,6 +681,7 @@ class IndustryDashboard:
 
     def _render_employment_chart(self, df: pd.DataFrame):
         """Render employment bar chart"""
+        import plotly.express as px  # loaded on first chart, not at app start
         # Add industry names if not already present or if they're generic
         df_chart = df.copy()
         if 'naics_title' not in df_chart.columns or df_chart['naics_title'].isna().all() or \
@@ -699,6 +706,7 @@ class IndustryDashboard:
 
     def _render_establishments_chart(self, df: pd.DataFrame):
         """Render establishments bar chart"""
+        import plotly.express as px  # loaded on first chart, not at app start
         # Add industry names if not already present or if they're generic
         df_chart = df.copy()
         if 'naics_title' not in df_chart.columns or df_chart['naics_title'].isna().all() or \
@@ -723,6 +731,7 @@ class IndustryDashboard:
 
     def _render_payroll_chart(self, df: pd.DataFrame):
         """Render payroll bar chart"""
+        import plotly.express as px  # loaded on first chart, not at app start
         # Filter out null payroll values
         df_filtered = df[df['annual_payroll'].notna()]
 
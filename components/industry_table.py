@@ -1,11 +1,11 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 from lib.naics import NAICSMapper
 from lib.utils import DataUtils
 
 def render_industry_table(data_service, county_fips: str):
     """Render industry analysis table"""
+    import plotly.express as px  # loaded on first chart, not at app start
     naics_mapper = NAICSMapper()
     data_utils = DataUtils()
     
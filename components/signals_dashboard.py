@@ -1,7 +1,5 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime, timedelta
 from lib.utils import DataUtils
 
@@ -162,6 +160,7 @@ def render_awards_signals(data_service, county_fips: str, data_utils):
 
 def render_license_signals(data_service, county_fips: str, data_utils):
     """Render business license signals"""
+    import plotly.express as px  # loaded on first chart, not at app start
     st.subheader("Business License Activity")
     
     with st.spinner("Loading license data..."):
@@ -1,6 +1,6 @@
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional, Tuple, Union
 from datetime import datetime, timedelta
 import streamlit as st
 
@@ -136,6 +136,45 @@ class DataUtils:
         
         return result
     
+    @staticmethod
+    def downsample_lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Downsample a line to n_out points (Largest-Triangle-Three-Buckets).
+        
+        Keeps the first and last points and, from each bucket in between, the
+        point forming the largest triangle with its neighbours, so peaks and
+        dips survive. x must be sorted; shorter series are returned as is.
+        """
+        x = np.asarray(x)
+        y = np.asarray(y)
+        n = len(x)
+        if n_out >= n or n_out < 3:
+            return x, y
+        
+        xf = x.astype(np.float64)
+        yf = y.astype(np.float64)
+        
+        # Bucket edges for the points between the fixed first and last ones
+        edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+        keep = np.empty(n_out, dtype=int)
+        keep[0], keep[-1] = 0, n - 1
+        
+        for i in range(n_out - 2):
+            start, stop = edges[i], edges[i + 1]
+            
+            # Average of the next bucket (or the last point) as the third vertex
+            next_stop = edges[i + 2] if i + 2 < len(edges) else n
+            avg_x = xf[stop:next_stop].mean()
+            avg_y = yf[stop:next_stop].mean()
+            
+            prev_x, prev_y = xf[keep[i]], yf[keep[i]]
+            areas = np.abs(
+                (prev_x - avg_x) * (yf[start:stop] - prev_y)
+                - (prev_x - xf[start:stop]) * (avg_y - prev_y)
+            )
+            keep[i + 1] = start + int(areas.argmax())
+        
+        return x[keep], y[keep]
+    
     @staticmethod
     def validate_data_quality(df: pd.DataFrame, 
                             required_columns: List[str],
@@ -18,8 +18,10 @@ class CacheManager:
             'cbp_data': 24,      # Census data changes infrequently
             'qcew_data': 24,     # BLS quarterly data
             'sba_data': 48,      # SBA data updates monthly
+            'sba_loans': 48,     # Filtered SBA loan records per county, year and program
             'sam_data': 12,      # SAM.gov updates more frequently
             'firm_data': 48,     # Firm demographics change slowly
+            'bfs_data': 24,      # National BFS county files, one per year
             'signals_data': 6    # Demand signals more dynamic
         }
     
@@ -59,15 +61,15 @@ class CacheManager:
         except Exception:
             return False
     
-    def get_cached_data(self, data_type: str, county_fips: str, **kwargs):
-        """Retrieve cached data if available and valid"""
+    def get_cached_data(self, data_type: str, county_fips: str, include_expired: bool = False, **kwargs):
+        """Retrieve cached data if available and valid (or expired, with include_expired)"""
         cache_key = self._get_cache_key(data_type, county_fips, **kwargs)
         cache_path = self._get_cache_path(cache_key)
         
         if not cache_path.exists():
             return None
         
-        if not self.is_cache_valid(cache_key, data_type):
+        if not include_expired and not self.is_cache_valid(cache_key, data_type):
             return None
         
         try:
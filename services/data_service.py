@@ -1,6 +1,6 @@
 import pandas as pd
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 import logging
 
 from db.database import DatabaseManager
@@ -15,15 +15,32 @@ from adapters.bfs import BFSAdapter
 from lib.naics import NAICSMapper
 from lib.utils import DataUtils
 from services.cache_manager import CacheManager
+from services.fetch_cache import FetchCache
+
+# Most recent companies sent with the dashboard
+TOP_COMPANY_LIMIT = 50
+
+def _data_freshness(db: DatabaseManager) -> List[Tuple[str, Optional[str], Optional[int]]]:
+    """Each source's last update and its age in days"""
+    now = datetime.now()
+    return [
+        (source, date, (now - datetime.fromisoformat(date)).days if date else None)
+        for source, date in db.get_data_freshness().items()
+    ]
 
 class DataService:
     """Main data service for fetching and processing government data"""
     
-    def __init__(self, db_manager: DatabaseManager):
+    def __init__(self, db_manager: DatabaseManager, fetch_cache: Optional[FetchCache] = None):
         self.db = db_manager
         self.naics_mapper = NAICSMapper()
         self.data_utils = DataUtils()
         self.cache_manager = CacheManager()
+        # Memo for the SAM, USAspending and SBA fetches, keyed on their
+        # arguments; a refresh clears it
+        self.fetch_cache = fetch_cache if fetch_cache is not None else FetchCache(ttl_seconds=86400)
+        # Freshness is read on every sidebar render, so it is parsed once a minute
+        self._freshness_cache = FetchCache(ttl_seconds=60)
         
         # Initialize adapters
         self.cbp_adapter = CBPAdapter()
@@ -156,6 +173,8 @@ class DataService:
                 print(f"📋 Using cached sba_data for {county_fips}")
                 return cached_data
             
+            if refresh:
+                self.fetch_cache.clear('sba_loans')
             if refresh or self._needs_refresh('sba', days=30):
                 self._fetch_and_store_sba_data(county_fips)
             
@@ -271,6 +290,8 @@ class DataService:
     def get_rfp_data(self, county_fips: str, refresh: bool = False) -> pd.DataFrame:
         """Get federal RFP opportunities data"""
         try:
+            if refresh:
+                self.fetch_cache.clear('opportunities')
             if refresh or self._needs_refresh('rfps', days=1):
                 self._fetch_and_store_rfp_data(county_fips)
             
@@ -292,6 +313,8 @@ class DataService:
     def get_awards_data(self, county_fips: str, refresh: bool = False) -> pd.DataFrame:
         """Get federal awards data"""
         try:
+            if refresh:
+                self.fetch_cache.clear('awards')
             if refresh or self._needs_refresh('awards', days=1):
                 self._fetch_and_store_awards_data(county_fips)
             
@@ -414,9 +437,9 @@ class DataService:
             self.logger.error(f"Error getting formation data for {county_fips}: {str(e)}")
             return pd.DataFrame()
     
-    def get_data_freshness(self) -> Dict[str, str]:
-        """Get data freshness for all sources"""
-        return self.db.get_data_freshness()
+    def get_data_freshness(self) -> List[Tuple[str, Optional[str], Optional[int]]]:
+        """Get data freshness for all sources as (source, last update, days old)"""
+        return self._freshness_cache.get(('freshness',), lambda: _data_freshness(self.db))
     
     def get_coverage_status(self, county_fips: str) -> Dict[str, bool]:
         """Get data coverage status for a county"""
@@ -461,7 +484,7 @@ class DataService:
             self.refresh_all_data(county_fips)
         return {
             "by_industry": scorer.industry_scores(county_fips),
-            "by_company": scorer.top_companies(county_fips),
+            "by_company": scorer.top_companies(county_fips, limit=TOP_COMPANY_LIMIT),
             "industry_size": scorer.size_breakdown(county_fips),
             "spend_ranges": scorer.spend_estimates(county_fips),
         }
@@ -469,6 +492,8 @@ class DataService:
     def get_rfp_data(self, county_fips: str, refresh: bool = False) -> List[Dict[str, Any]]:
         """Get RFP opportunities data for demand scoring"""
         try:
+            if refresh:
+                self.fetch_cache.clear('opportunities')
             if refresh or self._needs_refresh('rfps', days=7):
                 self._fetch_and_store_rfp_data(county_fips)
             
@@ -601,6 +626,25 @@ class DataService:
         except Exception as e:
             self.logger.error(f"Error fetching QCEW data: {str(e)}")
     
+    def _fetch_opportunities(self, county_fips: str) -> List[Dict[str, Any]]:
+        """SAM opportunities for a county, memoized"""
+        return self.fetch_cache.get(
+            ('opportunities', county_fips), lambda: self.sam_adapter.fetch_opportunities(county_fips)
+        )
+    
+    def _fetch_awards(self, county_fips: str, fiscal_year: int) -> List[Dict[str, Any]]:
+        """USAspending awards for a county and fiscal year, memoized"""
+        return self.fetch_cache.get(
+            ('awards', county_fips, fiscal_year),
+            lambda: self.usaspending_adapter.fetch_awards(county_fips, fiscal_year)
+        )
+    
+    def _fetch_sba_loans(self, county_fips: str, years: tuple) -> List[Dict[str, Any]]:
+        """SBA loan records for a county over several years, memoized"""
+        return self.fetch_cache.get(
+            ('sba_loans', county_fips, years), lambda: self.sba_adapter.fetch_multiple_years(county_fips, list(years))
+        )
+    
     def _fetch_and_store_sba_data(self, county_fips: str):
         """Fetch and store SBA loan data"""
         try:
@@ -608,7 +652,7 @@ class DataService:
             current_year = datetime.now().year
             years = [current_year, current_year - 1, current_year - 2]
             
-            sba_data = self.sba_adapter.fetch_multiple_years(county_fips, years)
+            sba_data = self._fetch_sba_loans(county_fips, tuple(years))
             
             if sba_data:
                 self.db.execute_bulk_insert('sba_loans', sba_data)
@@ -621,7 +665,7 @@ class DataService:
     def _fetch_and_store_rfp_data(self, county_fips: str):
         """Fetch and store RFP opportunities data"""
         try:
-            rfp_data = self.sam_adapter.fetch_opportunities(county_fips)
+            rfp_data = self._fetch_opportunities(county_fips)
             
             if rfp_data:
                 self.db.execute_bulk_insert('rfp_opps', rfp_data)
@@ -635,7 +679,7 @@ class DataService:
         """Fetch and store federal awards data"""
         try:
             current_year = datetime.now().year
-            awards_data = self.usaspending_adapter.fetch_awards(county_fips, current_year)
+            awards_data = self._fetch_awards(county_fips, current_year)
             
             if awards_data:
                 self.db.execute_bulk_insert('awards', awards_data)
@@ -715,6 +759,8 @@ class DataService:
                     return cached_data
             
             # If no cache or refresh requested, fetch fresh data
+            if refresh:
+                self.fetch_cache.clear()
             fresh_signals = self._fetch_fresh_demand_signals(county_fips)
             
             # Cache the fresh data
@@ -732,12 +778,12 @@ class DataService:
             print(f"🔍 Fetching fresh demand signals for {county_fips}")
             
             # Fetch RFP data directly from SAM adapter
-            rfp_data = self.sam_adapter.fetch_opportunities(county_fips)
+            rfp_data = self._fetch_opportunities(county_fips)
             rfp_df = pd.DataFrame(rfp_data) if rfp_data else pd.DataFrame()
             
             # Fetch awards data directly from USAspending adapter
             current_year = datetime.now().year
-            awards_data = self.usaspending_adapter.fetch_awards(county_fips, current_year)
+            awards_data = self._fetch_awards(county_fips, current_year)
             awards_df = pd.DataFrame(awards_data) if awards_data else pd.DataFrame()
             
             # Get business formation data (handle database errors gracefully)
@@ -972,6 +1018,7 @@ class DataService:
     def refresh_all_data(self, county_fips: str):
         """Refresh all data sources for a county"""
         self.logger.info(f"Starting full data refresh for {county_fips}")
+        self.fetch_cache.clear()
         
         try:
             self._fetch_and_store_cbp_data(county_fips)
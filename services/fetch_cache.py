@@ -0,0 +1,41 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+class FetchCache:
+    """In-memory memo for adapter fetches, with a time limit per entry.
+
+    Keys are tuples whose first element names the fetch (e.g.
+    ('awards', county_fips, fiscal_year)), so one kind can be cleared on its
+    own. Empty results are never stored: the adapters return [] when a fetch
+    fails, and a passing network error shouldn't hide the data until the
+    entry expires. Stored results are shared, so callers must not modify them.
+    """
+
+    def __init__(self, ttl_seconds: float = 86400):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[Tuple[Hashable, ...], Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[Hashable, ...], fetch: Callable[[], Any]) -> Any:
+        """Stored result for key, or the result of fetch() (kept if not empty)"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and now - entry[0] < self.ttl_seconds:
+            return entry[1]
+
+        result = fetch()
+        if result:
+            with self._lock:
+                self._entries[key] = (now, result)
+        return result
+
+    def clear(self, kind: Optional[Hashable] = None) -> None:
+        """Forget every entry, or only those of one kind"""
+        with self._lock:
+            if kind is None:
+                self._entries.clear()
+            else:
+                for key in [key for key in self._entries if key[0] == kind]:
+                    del self._entries[key]